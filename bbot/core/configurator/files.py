@@ -1,4 +1,6 @@
+import os
 import sys
+import yaml
 from pathlib import Path
 from omegaconf import OmegaConf
 
@@ -6,35 +8,84 @@ from ..helpers.misc import mkdir
 from ..errors import ConfigLoadError
 from ..helpers.logger import log_to_stderr
 
-config_dir = (Path.home() / ".config" / "bbot").resolve()
-defaults_filename = (Path(__file__).parent.parent.parent / "defaults.yml").resolve()
-mkdir(config_dir)
-config_filename = (config_dir / "bbot.yml").resolve()
-secrets_filename = (config_dir / "secrets.yml").resolve()
+# absolute() instead of resolve(), since we don't need symlinks resolved and it saves a bunch of syscalls on every import
+bbot_dir = Path(__file__).absolute().parents[2]
+config_dir = (Path.home() / ".config" / "bbot").absolute()
+defaults_filename = bbot_dir / "defaults.yml"
+# skip mkdir()'s touchfile write/unlink when the config dir is already usable
+if not (config_dir.is_dir() and os.access(config_dir, os.W_OK)):
+    mkdir(config_dir)
+config_filename = config_dir / "bbot.yml"
+secrets_filename = config_dir / "secrets.yml"
 default_config = None
 
+# use libyaml's C loader when available, it's much faster than the pure-python one
+yaml_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# parsed configs, keyed by filename + modification time
+_config_cache = {}
+_merged_config_cache = {}
+
+
+def _file_key(filename):
+    try:
+        stat = os.stat(filename)
+        return (str(filename), stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return (str(filename), None, None)
+
+
+def _load_yaml(filename):
+    with open(filename, "rb") as f:
+        data = yaml.load(f, Loader=yaml_loader)
+    if data is None:
+        return OmegaConf.create()
+    return OmegaConf.create(data)
+
 
 def _get_config(filename, name="config"):
     notify = False
     if sys.argv and sys.argv[0].endswith("bbot") and not any(x in sys.argv for x in ("-s", "--silent")):
         notify = True
-    filename = Path(filename).resolve()
+    filename = Path(filename).absolute()
+    key = _file_key(filename)
+    try:
+        return _config_cache[key]
+    except KeyError:
+        pass
+    # bbot.yml and secrets.yml don't exist until they're created, no need to try opening them
+    if key[1] is None:
+        return OmegaConf.create()
     try:
-        conf = OmegaConf.load(str(filename))
+        conf = _load_yaml(filename)
         if notify and __name__ == "__main__":
             log_to_stderr(f"Loaded {name} from {filename}")
-        return conf
     except Exception as e:
         if filename.exists():
             raise ConfigLoadError(f"Error parsing config at {filename}:\n\n{e}")
-        return OmegaConf.create()
+        conf = OmegaConf.create()
+    _config_cache[key] = conf
+    return conf
 
 
 def get_config():
+    """
+    Load and merge defaults.yml, bbot.yml, and secrets.yml.
+
+    The merged result is cached until one of the files changes on disk.
+    """
     global default_config
+    key = tuple(_file_key(f) for f in (defaults_filename, config_filename, secrets_filename))
+    try:
+        default_config, merged = _merged_config_cache[key]
+        return merged
+    except KeyError:
+        pass
     default_config = _get_config(defaults_filename, name="defaults")
-    return OmegaConf.merge(
+    merged = OmegaConf.merge(
         default_config,
         _get_config(config_filename, name="config"),
         _get_config(secrets_filename, name="secrets"),
     )
+    _merged_config_cache[key] = (default_config, merged)
+    return merged
@@ -4,7 +4,7 @@ from contextlib import suppress
 
 from bbot.core.errors import ValidationError
 from bbot.core.helpers import sha1, smart_decode, smart_encode_punycode
-from bbot.core.helpers.regexes import event_type_regexes, event_id_regex
+from bbot.core.helpers.regexes import event_type_regex, event_id_regex
 
 
 log = logging.getLogger("bbot.core.event.helpers")
@@ -26,7 +26,7 @@ def get_event_type(data):
     Notes:
         - Utilizes `smart_decode_punycode` and `smart_decode` to preprocess the data.
         - Makes use of `ipaddress` standard library to check for IP and network types.
-        - Checks against a set of predefined regular expressions stored in `event_type_regexes`.
+        - Checks against a set of predefined regular expressions stored in `event_type_regex`.
     """
 
     # IP address
@@ -42,12 +42,12 @@ def get_event_type(data):
     data = smart_encode_punycode(smart_decode(data).strip())
 
     # Strict regexes
-    for t, regexes in event_type_regexes.items():
-        for r in regexes:
-            if r.match(data):
-                if t == "URL":
-                    return "URL_UNVERIFIED", data
-                return t, data
+    match = event_type_regex.match(data)
+    if match:
+        t = match.lastgroup
+        if t == "URL":
+            return "URL_UNVERIFIED", data
+        return t, data
 
     raise ValidationError(f'Unable to autodetect event type from "{data}"')
 
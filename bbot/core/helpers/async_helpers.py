@@ -1,10 +1,11 @@
-import uuid
+import time
 import random
 import asyncio
 import logging
+import itertools
 import threading
-from datetime import datetime
-from queue import Queue, Empty
+from datetime import timedelta
+from queue import Queue
 from .misc import human_timedelta
 from contextlib import asynccontextmanager
 
@@ -14,12 +15,46 @@ from .cache import CacheDict
 
 
 class ShuffleQueue(asyncio.Queue):
+    """
+    An asyncio.Queue that hands out its items in random order
+
+    Backed by a plain list: puts are appends, and gets swap a random item to the end before popping it.
+    This keeps both operations O(1), unlike inserting at a random index in a deque.
+    """
+
+    def _init(self, maxsize):
+        self._queue = []
+
     def _put(self, item):
-        random_index = random.randint(0, self.qsize())
-        self._queue.insert(random_index, item)
+        self._queue.append(item)
 
     def _get(self):
-        return self._queue.popleft()
+        queue = self._queue
+        random_index = random.randrange(len(queue))
+        queue[random_index], queue[-1] = queue[-1], queue[random_index]
+        return queue.pop()
+
+    def drain(self, max_items=None):
+        """
+        Removes and returns up to `max_items` items (default: all of them) without raising QueueEmpty
+
+        Equivalent to calling `get_nowait()` in a loop, minus the per-item overhead and the exception at the end.
+        """
+        num_items = self.qsize()
+        if max_items is not None:
+            num_items = min(num_items, max_items)
+        items = [self._get() for _ in range(num_items)]
+        for _ in range(min(num_items, len(self._putters))):
+            self._wakeup_next(self._putters)
+        return items
+
+    def clear(self):
+        """
+        Discards everything in the queue at once
+        """
+        self._queue.clear()
+        while self._putters:
+            self._wakeup_next(self._putters)
 
 
 class _Lock(asyncio.Lock):
@@ -53,7 +88,8 @@ class NamedLock:
 class TaskCounter:
     def __init__(self):
         self.tasks = {}
-        self.lock = asyncio.Lock()  # create a new lock
+        # cheap unique IDs for tasks (this is entered several times per event, so uuid4() adds up)
+        self._task_ids = itertools.count()
 
     @property
     def value(self):
@@ -73,22 +109,21 @@ class TaskCounter:
             self.log = _log
 
         async def __aenter__(self):
-            self.task_id = uuid.uuid4()  # generate a unique ID for the task
+            self.task_id = next(self.manager._task_ids)  # generate a unique ID for the task
             # if self.log:
             #     log.trace(f"Starting task {self.task_name} ({self.task_id})")
-            async with self.manager.lock:  # acquire the lock
-                self.start_time = datetime.now()
-                self.manager.tasks[self.task_id] = self
+            # no lock needed; nothing awaits between here and the dict update
+            self.start_time = time.monotonic()
+            self.manager.tasks[self.task_id] = self
             return self.task_id  # this will be passed as 'task_id' to __aexit__
 
         async def __aexit__(self, exc_type, exc_val, exc_tb):
-            async with self.manager.lock:  # acquire the lock
-                self.manager.tasks.pop(self.task_id, None)  # remove only current task
+            self.manager.tasks.pop(self.task_id, None)  # remove only current task
             # if self.log:
             #     log.trace(f"Finished task {self.task_name} ({self.task_id})")
 
         def __str__(self):
-            running_for = human_timedelta(datetime.now() - self.start_time)
+            running_for = human_timedelta(timedelta(seconds=time.monotonic() - self.start_time))
             return f"{self.task_name} running for {running_for}"
 
 
@@ -96,27 +131,24 @@ def async_to_sync_gen(async_gen):
     # Queue to hold generated values
     queue = Queue()
 
-    # Flag to indicate if the async generator is done
-    is_done = False
+    # Put on the queue once the async generator is exhausted
+    done = object()
 
     # Function to run in the separate thread
     async def runner():
-        nonlocal is_done
         try:
             async for value in async_gen:
                 queue.put(value)
         finally:
-            is_done = True
+            queue.put(done)
 
     def generator():
         while True:
-            # Try to get a value from the queue
-            try:
-                yield queue.get(timeout=0.1)
-            except Empty:
-                # If the queue is empty, check if the async generator is done
-                if is_done:
-                    break
+            # Block until there's a value, instead of polling for one
+            value = queue.get()
+            if value is done:
+                break
+            yield value
 
     # Start the event loop in a separate thread
     thread = threading.Thread(target=lambda: asyncio.run(runner()))
@@ -1,7 +1,7 @@
 import os
+import stat
 import time
 import logging
-from contextlib import suppress
 from collections import OrderedDict
 
 from .misc import sha1
@@ -15,16 +15,17 @@ def cache_get(self, key, text=True, cache_hrs=24 * 7):
     Returns None if item is not in cache
     """
     filename = self.cache_filename(key)
-    if filename.is_file():
-        valid = self.is_cached(key, cache_hrs)
-        if valid:
+    mtime = _cache_mtime(filename)
+    if mtime is not None:
+        if _cache_valid(mtime, cache_hrs):
             open_kwargs = {}
             if text:
                 open_kwargs.update({"mode": "r", "encoding": "utf-8", "errors": "ignore"})
             else:
                 open_kwargs["mode"] = "rb"
             log.debug(f'Using cached content for "{key}"')
-            return open(filename, **open_kwargs).read()
+            with open(filename, **open_kwargs) as f:
+                return f.read()
         else:
             log.debug(f'Cached content for "{key}" is older than {cache_hrs:,} hours')
 
@@ -44,11 +45,25 @@ def cache_put(self, key, content):
 
 
 def is_cached(self, key, cache_hrs=24 * 7):
-    filename = self.cache_filename(key)
-    if filename.is_file():
-        (m, i, d, n, u, g, sz, atime, mtime, ctime) = os.stat(filename)
-        return mtime > time.time() - cache_hrs * 3600
-    return False
+    mtime = _cache_mtime(self.cache_filename(key))
+    return mtime is not None and _cache_valid(mtime, cache_hrs)
+
+
+def _cache_mtime(filename):
+    """
+    Returns the modification time of a cache file, or None if it isn't a file
+    """
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st.st_mtime
+
+
+def _cache_valid(mtime, cache_hrs):
+    return mtime > time.time() - cache_hrs * 3600
 
 
 def cache_filename(self, key):
@@ -70,35 +85,24 @@ class CacheDict:
     def get(self, name, fallback=_sentinel):
         name_hash = self._hash(name)
         try:
-            return self._cache[name_hash]
+            value = self._cache[name_hash]
         except KeyError:
             if fallback is not _sentinel:
                 return fallback
             raise
-        finally:
-            with suppress(KeyError):
-                self._cache.move_to_end(name_hash)
-            self._truncate()
+        self._cache.move_to_end(name_hash)
+        return value
 
     def put(self, name, value):
         name_hash = self._hash(name)
-        try:
-            self._cache[name_hash] = value
-        finally:
-            with suppress(KeyError):
-                self._cache.move_to_end(name_hash)
-            self._truncate()
+        self._cache[name_hash] = value
+        self._cache.move_to_end(name_hash)
+        self._truncate()
 
     def _truncate(self):
-        if not self or len(self) <= self._max_size:
-            return
-        for nh in list(self._cache.keys()):
-            try:
-                del self._cache[nh]
-            except KeyError:
-                pass
-            if not self or len(self) <= self._max_size:
-                break
+        # evict the least recently used entries, which are always at the front
+        while self._cache and len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
 
     def keys(self):
         return self._cache.keys()
@@ -21,6 +21,7 @@ import traceback
 import subprocess as sp
 from pathlib import Path
 from itertools import islice
+from functools import lru_cache
 from datetime import datetime
 from tabulate import tabulate
 import wordninja as _wordninja
@@ -406,8 +407,14 @@ def tldextract(data):
     Notes:
         - Utilizes `smart_decode` to preprocess the data.
         - Makes use of the `tldextract` library for extraction.
+        - Results are cached, since the same hosts are checked over and over during a scan.
     """
-    return _tldextract.extract(smart_decode(data))
+    return _tldextract_cached(smart_decode(data))
+
+
+@lru_cache(maxsize=65536)
+def _tldextract_cached(s):
+    return _tldextract.extract(s)
 
 
 def split_domain(hostname):
@@ -479,8 +486,11 @@ def ip_network_parents(i, include_self=False):
         - Utilizes Python's built-in `ipaddress` module for network operations.
     """
     net = ipaddress.ip_network(i, strict=False)
+    # build the parents straight from the integer address instead of formatting and re-parsing a string for each one
+    network_type = type(net)
+    network_address = int(net.network_address)
     for i in range(net.prefixlen - (0 if include_self else 1), -1, -1):
-        yield ipaddress.ip_network(f"{net.network_address}/{i}", strict=False)
+        yield network_type((network_address, i), strict=False)
 
 
 def is_port(p):
@@ -528,12 +538,10 @@ def is_dns_name(d, include_local=True):
     if is_ip(d):
         return False
     d = smart_decode(d)
-    if include_local:
-        if bbot_regexes.hostname_regex.match(d):
-            return True
-    if bbot_regexes.dns_name_regex.match(d):
-        return True
-    return False
+    # hostnames can't contain a period, and dns names must
+    if "." not in d:
+        return include_local and bool(bbot_regexes.hostname_regex.match(d))
+    return bool(bbot_regexes.dns_name_regex.match(d))
 
 
 def is_ip(d, version=None):
@@ -560,6 +568,9 @@ def is_ip(d, version=None):
     if isinstance(d, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
         if version is None or version == d.version:
             return True
+    # fast path for hostnames: IPv4 addresses end in a digit and IPv6 addresses contain a colon
+    if isinstance(d, str) and not (d[-1:].isdigit() or ":" in d):
+        return False
     try:
         ip = ipaddress.ip_address(d)
         if version is None or ip.version == version:
@@ -678,9 +689,7 @@ def host_in_host(host1, host2):
 
     # else hostnames
     elif not (host1_ip_type or host2_ip_type):
-        host2_len = len(host2.split("."))
-        host1_truncated = ".".join(host1.split(".")[-host2_len:])
-        return host1_truncated == host2
+        return host1 == host2 or host1.endswith(f".{host2}")
 
     return False
 
@@ -749,6 +758,7 @@ def smart_encode(data):
 
 encoded_regex = re.compile(r"%[0-9a-fA-F]{2}|\\u[0-9a-fA-F]{4}|\\U[0-9a-fA-F]{8}|\\[ntrbv]")
 backslash_regex = re.compile(r"(?P<slashes>\\+)(?P<char>[ntrvb])")
+backslash_escapes = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "v": "\v"}
 
 
 def recursive_decode(data, max_depth=5):
@@ -773,12 +783,13 @@ def recursive_decode(data, max_depth=5):
         " Привет!"
     """
     # Decode newline and tab escapes
-    data = backslash_regex.sub(
-        lambda match: {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "v": "\v"}.get(match.group("char")), data
-    )
+    data = backslash_regex.sub(lambda match: backslash_escapes.get(match.group("char")), data)
     data = smart_decode(data)
     if max_depth == 0:
         return data
+    # for ASCII text without a "%" or a backslash, neither decoding step below can change anything
+    if "%" not in data and "\\" not in data and data.isascii():
+        return data
     # Decode URL encoding
     data = unquote(data, errors="ignore")
     # Decode Unicode escapes
@@ -929,32 +940,37 @@ def extract_params_html(html_data):
         >>> list(extract_params_html(html_data))
         ['user', 'param2', 'param3']
     """
-    input_tag = bbot_regexes.input_tag_regex.findall(html_data)
+    # each regex needs a literal substring to match, so we can skip scanning the whole page when it's missing
+    if "<input" in html_data:
+        input_tag = bbot_regexes.input_tag_regex.findall(html_data)
 
-    for i in input_tag:
-        log.debug(f"FOUND PARAM ({i}) IN INPUT TAGS")
-        yield i
+        for i in input_tag:
+            log.debug(f"FOUND PARAM ({i}) IN INPUT TAGS")
+            yield i
 
     # check for jquery get parameters
-    jquery_get = bbot_regexes.jquery_get_regex.findall(html_data)
+    if "url:" in html_data:
+        jquery_get = bbot_regexes.jquery_get_regex.findall(html_data)
 
-    for i in jquery_get:
-        log.debug(f"FOUND PARAM ({i}) IN JQUERY GET PARAMS")
-        yield i
+        for i in jquery_get:
+            log.debug(f"FOUND PARAM ({i}) IN JQUERY GET PARAMS")
+            yield i
 
     # check for jquery post parameters
-    jquery_post = bbot_regexes.jquery_post_regex.findall(html_data)
-    if jquery_post:
-        for i in jquery_post:
-            for x in i.split(","):
-                s = x.split(":")[0].rstrip()
-                log.debug(f"FOUND PARAM ({s}) IN A JQUERY POST PARAMS")
-                yield s
-
-    a_tag = bbot_regexes.a_tag_regex.findall(html_data)
-    for s in a_tag:
-        log.debug(f"FOUND PARAM ({s}) IN A TAG GET PARAMS")
-        yield s
+    if "post(" in html_data:
+        jquery_post = bbot_regexes.jquery_post_regex.findall(html_data)
+        if jquery_post:
+            for i in jquery_post:
+                for x in i.split(","):
+                    s = x.split(":")[0].rstrip()
+                    log.debug(f"FOUND PARAM ({s}) IN A JQUERY POST PARAMS")
+                    yield s
+
+    if "<a" in html_data:
+        a_tag = bbot_regexes.a_tag_regex.findall(html_data)
+        for s in a_tag:
+            log.debug(f"FOUND PARAM ({s}) IN A TAG GET PARAMS")
+            yield s
 
 
 def extract_words(data, acronyms=True, wordninja=True, model=None, max_length=100, word_regexes=None):
@@ -983,21 +999,19 @@ def extract_words(data, acronyms=True, wordninja=True, model=None, max_length=10
         word_regexes = bbot_regexes.word_regexes
     words = set()
     data = smart_decode(data)
+    # the word regexes overlap (e.g. "black-lantern" vs. "black" + "lantern"), so each one needs its own pass
     for r in word_regexes:
-        for word in set(r.findall(data)):
-            # blacklanternsecurity
-            if len(word) <= max_length:
-                words.add(word)
+        # blacklanternsecurity
+        words.update(word for word in r.findall(data) if len(word) <= max_length)
 
+    if model is None:
+        model = _wordninja
     # blacklanternsecurity --> ['black', 'lantern', 'security']
     # max_slice_length = 3
     for word in list(words):
         if wordninja:
-            if model is None:
-                model = _wordninja
             subwords = model.split(word)
-            for subword in subwords:
-                words.add(subword)
+            words.update(subwords)
         # this section generates compound words
         # it is interesting but currently disabled the quality of its output doesn't quite justify its quantity
         # blacklanternsecurity --> ['black', 'lantern', 'security', 'blacklantern', 'lanternsecurity']
@@ -1008,7 +1022,7 @@ def extract_words(data, acronyms=True, wordninja=True, model=None, max_length=10
         # blacklanternsecurity --> bls
         if acronyms:
             if len(subwords) > 1:
-                words.add("".join([c[0] for c in subwords if len(c) > 0]))
+                words.add("".join(c[0] for c in subwords if c))
 
     return words
 
@@ -1034,8 +1048,10 @@ def closest_match(s, choices, n=1, cutoff=0.0):
         >>> closest_match("asdf", ["asd", "fds", "asdff"], n=3)
         ['asdff', 'asd', 'fds']
     """
+    if not choices:
+        return
     matches = difflib.get_close_matches(s, choices, n=n, cutoff=cutoff)
-    if not choices or not matches:
+    if not matches:
         return
     if n == 1:
         return matches[0]
@@ -1283,7 +1299,8 @@ def make_netloc(host, port):
         >>> make_netloc("dead::beef", 443)
         "[dead::beef]:443"
     """
-    if is_ip(host, version=6):
+    # every IPv6 address contains a colon, so only those hosts need the ipaddress check
+    if ":" in str(host) and is_ip(host, version=6):
         host = f"[{host}]"
     if port is None:
         return host
@@ -1458,15 +1475,20 @@ def clean_dict(d, *key_names, fuzzy=False, exclude_keys=None, _prev_key=None):
         exclude_keys = []
     if isinstance(exclude_keys, str):
         exclude_keys = [exclude_keys]
+    # copy once up front, then clean the copy in place
     d = copy.deepcopy(d)
+    _clean_dict(d, key_names, fuzzy, exclude_keys, _prev_key)
+    return d
+
+
+def _clean_dict(d, key_names, fuzzy, exclude_keys, prev_key):
     if isinstance(d, dict):
         for key, val in list(d.items()):
             if key in key_names or (fuzzy and any(k in key for k in key_names)):
-                if _prev_key not in exclude_keys:
+                if prev_key not in exclude_keys:
                     d.pop(key)
             else:
-                d[key] = clean_dict(val, *key_names, fuzzy=fuzzy, _prev_key=key, exclude_keys=exclude_keys)
-    return d
+                _clean_dict(val, key_names, fuzzy, exclude_keys, key)
 
 
 def grouper(iterable, n):
@@ -1750,7 +1772,10 @@ def extract_emails(s):
         >>> list(extract_emails("Contact us at info@evilcorp.com and support@evilcorp.com"))
         ['info@evilcorp.com', 'support@evilcorp.com']
     """
-    for email in bbot_regexes.email_regex.findall(smart_decode(s)):
+    s = smart_decode(s)
+    if "@" not in s:
+        return
+    for email in bbot_regexes.email_regex.findall(s):
         yield email.lower()
 
 
@@ -1813,14 +1838,15 @@ def smart_encode_punycode(text: str) -> str:
     """
     ドメイン.テスト --> xn--eckwd4c7c.xn--zckzah
     """
+    # idna.encode() leaves ASCII hosts as they are, so there's nothing to do
+    if text.isascii():
+        return text
+
     host, before, after = extract_host(text)
     if host is None:
         return text
 
-    try:
-        host = idna.encode(host).decode(errors="ignore")
-    except UnicodeError:
-        pass  # If encoding fails, leave the host as it is
+    host = _encode_punycode_host(host)
 
     return f"{before}{host}{after}"
 
@@ -1833,12 +1859,25 @@ def smart_decode_punycode(text: str) -> str:
     if host is None:
         return text
 
+    host = _decode_punycode_host(host)
+
+    return f"{before}{host}{after}"
+
+
+@lru_cache(maxsize=10000)
+def _encode_punycode_host(host):
     try:
-        host = idna.decode(host)
+        return idna.encode(host).decode(errors="ignore")
     except UnicodeError:
-        pass  # If decoding fails, leave the host as it is
+        return host  # If encoding fails, leave the host as it is
 
-    return f"{before}{host}{after}"
+
+@lru_cache(maxsize=10000)
+def _decode_punycode_host(host):
+    try:
+        return idna.decode(host)
+    except UnicodeError:
+        return host  # If decoding fails, leave the host as it is
 
 
 def can_sudo_without_password():
@@ -1974,6 +2013,9 @@ def human_timedelta(d):
     return ret
 
 
+filesize_suffixes = ("B", "KB", "MB", "GB", "TB", "PB", "EB", "ZB")
+
+
 def bytes_to_human(_bytes):
     """Convert a bytes size to a human-readable string.
 
@@ -1991,13 +2033,9 @@ def bytes_to_human(_bytes):
         >>> bytes_to_human(1234129384)
         '1.15GB'
     """
-    sizes = ["B", "KB", "MB", "GB", "TB", "PB", "EB", "ZB"]
-    units = {}
-    for count, size in enumerate(sizes):
-        units[size] = pow(1024, count)
-    for size in sizes:
+    for size in filesize_suffixes:
         if abs(_bytes) < 1024.0:
-            if size == sizes[0]:
+            if size == "B":
                 _bytes = str(int(_bytes))
             else:
                 _bytes = f"{_bytes:.2f}"
@@ -2007,6 +2045,9 @@ def bytes_to_human(_bytes):
 
 
 filesize_regex = re.compile(r"(?P<num>[0-9\.]+)[\s]*(?P<char>[a-z])", re.I)
+filesize_units = {size: pow(1024, count) for count, size in enumerate(filesize_suffixes)}
+# single-letter aliases, e.g. "K" for "KB"
+filesize_units.update({size[0]: units for size, units in list(filesize_units.items()) if len(size) == 2})
 
 
 def human_to_bytes(filesize):
@@ -2030,19 +2071,12 @@ def human_to_bytes(filesize):
     """
     if isinstance(filesize, int):
         return filesize
-    sizes = ["B", "KB", "MB", "GB", "TB", "PB", "EB", "ZB"]
-    units = {}
-    for count, size in enumerate(sizes):
-        size_increment = pow(1024, count)
-        units[size] = size_increment
-        if len(size) == 2:
-            units[size[0]] = size_increment
     match = filesize_regex.match(filesize)
     try:
         if match:
             num, size = match.groups()
             size = size.upper()
-            size_increment = units[size]
+            size_increment = filesize_units[size]
             return int(float(num) * size_increment)
     except KeyError:
         pass
@@ -2128,8 +2162,13 @@ def tagify(s, maxlen=None):
         >>> tagify("HTTP Web Title", maxlen=8)
         'http-web'
     """
-    ret = str(s).lower()
-    return tag_filter_regex.sub("-", ret)[:maxlen].strip("-")
+    return _tagify(str(s), maxlen)
+
+
+# the same handful of tags get applied to most events, so the results are cached
+@lru_cache(maxsize=10000)
+def _tagify(s, maxlen):
+    return tag_filter_regex.sub("-", s.lower())[:maxlen].strip("-")
 
 
 def memory_status():
@@ -2177,6 +2216,9 @@ def swap_status():
     return psutil.swap_memory()
 
 
+get_size_scalar_types = frozenset((str, bytes, int, float, bool, type(None)))
+
+
 def get_size(obj, max_depth=5, seen=None):
     """
     Roughly estimate the memory footprint of a Python object using recursion.
@@ -2210,6 +2252,9 @@ def get_size(obj, max_depth=5, seen=None):
     size = sys.getsizeof(obj)
     # Add the object's id to the set of seen objects
     seen.add(obj_id)
+    # Scalars don't contain anything else, so skip the attribute and container checks below
+    if type(obj) in get_size_scalar_types:
+        return size
     # If the object has a __dict__ attribute, we want to measure its size
     if hasattr(obj, "__dict__"):
         # Iterate over the Method Resolution Order (MRO) of the class of the object
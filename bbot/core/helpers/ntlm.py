@@ -36,27 +36,28 @@ target_field_types[5] = "DNS_Tree_Name"
 target_field_types[7] = "Timestamp"
 
 
+# struct layouts for the challenge header, the target info field, and each AV pair inside it
+challenge_header_struct = struct.Struct("<hhiiQ")
+target_info_struct = struct.Struct("<hhi")
+av_pair_struct = struct.Struct("<hh")
+
+
 def decode_ntlm_challenge(st):
-    hdr_tup = struct.unpack("<hhiiQ", st[12:32])
+    # raises struct.error if the message is too short to be a challenge
+    challenge_header_struct.unpack_from(st, 12)
+
     parsed_challange = {}
 
-    nxt = st[40:48]
-    if len(nxt) == 8:
-        hdr_tup = struct.unpack("<hhi", nxt)
+    if len(st) >= 48:
+        hdr_tup = target_info_struct.unpack_from(st, 40)
         tgt = StrStruct(hdr_tup, st)
 
-        output = "Target: [block] (%db @%d)" % (tgt.length, tgt.offset)
-        if tgt.alloc != tgt.length:
-            output += " alloc: %d" % tgt.alloc
-
         raw = tgt.raw
         pos = 0
 
         while pos + 4 < len(raw):
-            rec_hdr = struct.unpack("<hh", raw[pos : pos + 4])
-            rec_type_id = rec_hdr[0]
+            rec_type_id, rec_sz = av_pair_struct.unpack_from(raw, pos)
             rec_type = target_field_types[rec_type_id]
-            rec_sz = rec_hdr[1]
             subst = raw[pos + 4 : pos + 4 + rec_sz]
             try:
                 parsed_challange[rec_type] = subst.replace(b"\x00", b"").decode()
@@ -57,32 +57,40 @@ url_regexes = list(re.compile(r, re.I) for r in _url_regexes)
 _double_slash_regex = r"/{2,}"
 double_slash_regex = re.compile(_double_slash_regex)
 
+_event_type_regexes = (
+    (
+        "DNS_NAME",
+        (
+            _dns_name_regex,
+            _hostname_regex,
+        ),
+    ),
+    (
+        "EMAIL_ADDRESS",
+        (_email_regex,),
+    ),
+    (
+        "OPEN_TCP_PORT",
+        _open_port_regexes,
+    ),
+    (
+        "URL",
+        _url_regexes,
+    ),
+)
+
 # event type regexes, used throughout BBOT for autodetection of event types, validation, and excavation.
 event_type_regexes = OrderedDict(
-    (
-        (k, tuple(re.compile(r, re.I) for r in regexes))
-        for k, regexes in (
-            (
-                "DNS_NAME",
-                (
-                    r"^" + _dns_name_regex + r"$",
-                    r"^" + _hostname_regex + r"$",
-                ),
-            ),
-            (
-                "EMAIL_ADDRESS",
-                (r"^" + _email_regex + r"$",),
-            ),
-            (
-                "OPEN_TCP_PORT",
-                tuple(r"^" + r + r"$" for r in _open_port_regexes),
-            ),
-            (
-                "URL",
-                tuple(r"^" + r + r"$" for r in _url_regexes),
-            ),
-        )
-    )
+    ((k, tuple(re.compile(r"^" + r + r"$", re.I) for r in regexes)) for k, regexes in _event_type_regexes)
+)
+
+# all of the above combined into a single regex, so an event type can be detected in one pass
+# the name of the matching group is the event type, alternatives are tried in the same order as above
+event_type_regex = re.compile(
+    r"^(?:"
+    + "|".join(f"(?P<{k}>" + "|".join(f"(?:{r})" for r in regexes) + ")" for k, regexes in _event_type_regexes)
+    + r")$",
+    re.I,
 )
 
 event_id_regex = re.compile(r"[0-9a-f]{40}:[A-Z0-9_]+")
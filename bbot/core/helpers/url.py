@@ -3,8 +3,6 @@ import logging
 from contextlib import suppress
 from urllib.parse import urlparse, parse_qs, urlencode, ParseResult
 
-from .regexes import double_slash_regex
-
 
 log = logging.getLogger("bbot.core.helpers.url")
 
@@ -213,7 +211,6 @@ def url_depth(url):
         3
     """
     parsed = parse_url(url)
-    parsed = parsed._replace(path=double_slash_regex.sub("/", parsed.path))
-    split_path = str(parsed.path).strip("/").split("/")
-    split_path = [e for e in split_path if e]
+    # empty segments (from double slashes) are skipped, so there's no need to normalize the path first
+    split_path = [e for e in str(parsed.path).split("/") if e]
     return len(split_path)
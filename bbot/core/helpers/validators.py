@@ -62,7 +62,10 @@ def validate_port(port: Union[str, int]):
         >>> validate_port(-123)
         1
     """
-    return max(1, min(65535, int(str(port))))
+    # ints (the common case) don't need the round trip through str()
+    if type(port) is not int:
+        port = int(str(port))
+    return max(1, min(65535, port))
 
 
 @validator
@@ -200,7 +203,8 @@ def clean_url(url: str):
         netloc = f"[{netloc}]"
     parsed = parsed._replace(netloc=netloc)
     # normalize double slashes
-    parsed = parsed._replace(path=regexes.double_slash_regex.sub("/", parsed.path))
+    if "//" in parsed.path:
+        parsed = parsed._replace(path=regexes.double_slash_regex.sub("/", parsed.path))
     # append / if path is empty
     if parsed.path == "":
         parsed = parsed._replace(path="/")
@@ -235,13 +239,8 @@ def _collapse_urls(urls, threshold=10):
             new_url = clean_url(url)
         except ValueError as e:
             log.verbose(f"Failed to clean url {url}: {e}")
-        url_hash = hash_url(new_url)
-        try:
-            url_hashes[url_hash].add(new_url)
-        except KeyError:
-            url_hashes[url_hash] = {
-                new_url,
-            }
+            continue
+        url_hashes.setdefault(hash_url(new_url), set()).add(new_url)
 
     for url_hash, new_urls in url_hashes.items():
         # if the number of URLs exceeds the threshold
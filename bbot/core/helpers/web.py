@@ -7,6 +7,8 @@ import logging
 import warnings
 import traceback
 from pathlib import Path
+from itertools import islice
+from collections import deque
 from bs4 import BeautifulSoup
 from contextlib import asynccontextmanager
 
@@ -59,6 +61,9 @@ class BBOTAsyncClient(httpx.AsyncClient):
 
         self._persist_cookies = kwargs.pop("persist_cookies", True)
 
+        # custom headers for in-scope requests
+        self._http_headers = dict(self._bbot_scan.config.get("http_headers", None) or {})
+
         # timeout
         http_timeout = self._bbot_scan.config.get("http_timeout", 20)
         if not "timeout" in kwargs:
@@ -88,8 +93,9 @@ class BBOTAsyncClient(httpx.AsyncClient):
     def build_request(self, *args, **kwargs):
         request = super().build_request(*args, **kwargs)
         # add custom headers if the URL is in-scope
-        if self._bbot_scan.in_scope(str(request.url)):
-            for hk, hv in self._bbot_scan.config.get("http_headers", {}).items():
+        # (there's no need to check the scope if there aren't any)
+        if self._http_headers and self._bbot_scan.in_scope(str(request.url)):
+            for hk, hv in self._http_headers.items():
                 # don't clobber headers
                 if hk not in request.headers:
                     request.headers[hk] = hv
@@ -111,7 +117,10 @@ class WebHelper:
         parent_helper (object): The parent helper object containing scan configurations.
         http_debug (bool): Flag to indicate whether HTTP debugging is enabled.
         ssl_verify (bool): Flag to indicate whether SSL verification is enabled.
+        http_timeout, http_retries, user_agent, http_headers, web_spider_depth, web_spider_distance:
+            Plain copies of the scan's config values, so they don't need to be looked up on every request.
         web_client (BBOTAsyncClient): An instance of BBOTAsyncClient for making HTTP requests.
+        _clients (dict): Pooled BBOTAsyncClients for requests that need custom client options, keyed by those options.
         client_only_options (tuple): A tuple of options only applicable to the web client.
 
     Examples:
@@ -132,20 +141,59 @@ class WebHelper:
 
     def __init__(self, parent_helper):
         self.parent_helper = parent_helper
-        self.http_debug = self.parent_helper.config.get("http_debug", False)
+        config = self.parent_helper.config
+        self.http_debug = config.get("http_debug", False)
+        self.http_timeout = config.get("http_timeout", 20)
+        self.http_retries = config.get("http_retries", 1)
+        self.user_agent = config.get("user_agent", "BBOT")
+        self.http_headers = dict(config.get("http_headers", None) or {})
+        self.web_spider_depth = config.get("web_spider_depth", 1)
+        self.web_spider_distance = config.get("web_spider_distance", 0)
         self._ssl_context_noverify = None
         self.ssl_verify = self.parent_helper.config.get("ssl_verify", False)
         if self.ssl_verify is False:
             self.ssl_verify = self.ssl_context_noverify()
         self.web_client = self.AsyncClient(persist_cookies=False)
+        self._clients = {}
+        self._curl_httpx_client = None
 
     def AsyncClient(self, *args, **kwargs):
         kwargs["_bbot_scan"] = self.parent_helper.scan
-        retries = kwargs.pop("retries", self.parent_helper.config.get("http_retries", 1))
+        retries = kwargs.pop("retries", self.http_retries)
         kwargs["transport"] = httpx.AsyncHTTPTransport(retries=retries, verify=self.ssl_verify)
         kwargs["verify"] = self.ssl_verify
         return BBOTAsyncClient(*args, **kwargs)
 
+    def pooled_client(self, **client_kwargs):
+        """
+        Returns a BBOTAsyncClient for the given client options (e.g. `retries`, `max_redirects`).
+
+        Clients are created once per unique set of options and reused, so their connections stay alive
+        between requests. Like `web_client`, they don't persist cookies.
+
+        Examples:
+            >>> client = self.helpers.web.pooled_client(retries=0)
+        """
+        key = tuple(sorted(client_kwargs.items()))
+        try:
+            return self._clients[key]
+        except KeyError:
+            client = self.AsyncClient(persist_cookies=False, **client_kwargs)
+            self._clients[key] = client
+            return client
+
+    async def close(self):
+        """
+        Closes all the pooled clients created by `pooled_client()`, along with the one used by `curl()`.
+        """
+        clients = list(self._clients.values())
+        self._clients.clear()
+        if self._curl_httpx_client is not None:
+            clients.append(self._curl_httpx_client)
+            self._curl_httpx_client = None
+        for client in clients:
+            await client.aclose()
+
     async def request(self, *args, **kwargs):
         """
         Asynchronous function for making HTTP requests, intended to be the most basic web request function
@@ -219,7 +267,7 @@ class WebHelper:
                 client_kwargs[k] = v
 
         if client_kwargs:
-            client = self.AsyncClient(**client_kwargs)
+            client = self.pooled_client(**client_kwargs)
 
         async with self._acatch(url, raise_error):
             if self.http_debug:
@@ -265,7 +313,7 @@ class WebHelper:
             max_size = self.parent_helper.human_to_bytes(max_size)
         cache_hrs = float(kwargs.pop("cache_hrs", -1))
         total_size = 0
-        chunk_size = 8192
+        chunk_size = 1024 * 1024
         log.debug(f"Downloading file from {url} with cache_hrs={cache_hrs}")
         if cache_hrs > 0 and self.parent_helper.is_cached(url):
             log.debug(f"{url} is cached at {self.parent_helper.cache_filename(url)}")
@@ -277,7 +325,7 @@ class WebHelper:
             if not "method" in kwargs:
                 kwargs["method"] = "GET"
             try:
-                async with self._acatch(url, raise_error), self.AsyncClient().stream(url=url, **kwargs) as response:
+                async with self._acatch(url, raise_error), self.web_client.stream(url=url, **kwargs) as response:
                     status_code = getattr(response, "status_code", 0)
                     log.debug(f"Download result: HTTP {status_code}")
                     if status_code != 0:
@@ -285,13 +333,14 @@ class WebHelper:
                         with open(filename, "wb") as f:
                             agen = response.aiter_bytes(chunk_size=chunk_size)
                             async for chunk in agen:
-                                if max_size is not None and total_size + chunk_size > max_size:
+                                if max_size is not None and total_size + len(chunk) > max_size:
                                     log.verbose(
                                         f"Filesize of {url} exceeds {self.parent_helper.bytes_to_human(max_size)}, file will be truncated"
                                     )
-                                    agen.aclose()
+                                    f.write(chunk[: max_size - total_size])
+                                    await agen.aclose()
                                     break
-                                total_size += chunk_size
+                                total_size += len(chunk)
                                 f.write(chunk)
                         success = True
             except httpx.HTTPError as e:
@@ -348,16 +397,20 @@ class WebHelper:
             return filename
         else:
             lines = int(lines)
-            with open(filename) as f:
-                read_lines = f.readlines()
-            cache_key = f"{filename}:{lines}"
+            # the truncated copy is reused until the original wordlist changes
+            stat = filename.stat()
+            cache_key = f"{filename}:{stat.st_mtime_ns}:{stat.st_size}:{lines}"
             truncated_filename = self.parent_helper.cache_filename(cache_key)
-            with open(truncated_filename, "w") as f:
-                for line in read_lines[:lines]:
-                    f.write(line)
+            if truncated_filename.is_file():
+                return truncated_filename
+            # only read as many lines as we need
+            tmp_filename = truncated_filename.with_suffix(f".{self.parent_helper.rand_string()}.tmp")
+            with open(filename) as infile, open(tmp_filename, "w") as outfile:
+                outfile.writelines(islice(infile, lines))
+            tmp_filename.replace(truncated_filename)
             return truncated_filename
 
-    async def api_page_iter(self, url, page_size=100, json=True, next_key=None, **requests_kwargs):
+    async def api_page_iter(self, url, page_size=100, json=True, next_key=None, concurrency=1, **requests_kwargs):
         """
         An asynchronous generator function for iterating through paginated API data.
 
@@ -370,6 +423,8 @@ class WebHelper:
             page_size (int, optional): The number of items per page. Defaults to 100.
             json (bool, optional): If True, attempts to deserialize the response content to a JSON object. Defaults to True.
             next_key (callable, optional): A function that takes the last page's data and returns the URL for the next page. Defaults to None.
+            concurrency (int, optional): How many pages to request ahead of time. Pages are still yielded in order.
+                Ignored when `next_key` is used, since each URL depends on the previous page. Defaults to 1.
             **requests_kwargs: Arbitrary keyword arguments that will be forwarded to the HTTP request function.
 
         Yields:
@@ -392,27 +447,47 @@ class WebHelper:
         page = 1
         offset = 0
         result = None
-        while 1:
-            if result and callable(next_key):
+        prefetch = 1 if callable(next_key) else max(1, int(concurrency))
+        # (url, task) for pages that have been requested ahead of time
+        pending = deque()
+        try:
+            while 1:
+                if result and callable(next_key):
+                    try:
+                        new_url = next_key(result)
+                    except Exception as e:
+                        log.debug(f"Failed to extract next page of results from {url}: {e}")
+                        log.debug(traceback.format_exc())
+                        break
+                    result = await self.request(new_url, **requests_kwargs)
+                elif prefetch > 1:
+                    while len(pending) < prefetch:
+                        i = len(pending)
+                        prefetch_url = url.format(page=page + i, page_size=page_size, offset=offset + (i * page_size))
+                        pending.append(
+                            (prefetch_url, asyncio.create_task(self.request(prefetch_url, **requests_kwargs)))
+                        )
+                    new_url, task = pending.popleft()
+                    result = await task
+                else:
+                    new_url = url.format(page=page, page_size=page_size, offset=offset)
+                    result = await self.request(new_url, **requests_kwargs)
                 try:
-                    new_url = next_key(result)
-                except Exception as e:
-                    log.debug(f"Failed to extract next page of results from {url}: {e}")
-                    log.debug(traceback.formate_exc())
-            else:
-                new_url = url.format(page=page, page_size=page_size, offset=offset)
-            result = await self.request(new_url, **requests_kwargs)
-            try:
-                if json:
-                    result = result.json()
-                yield result
-            except Exception:
-                log.warning(f'Error in api_page_iter() for url: "{new_url}"')
-                log.trace(traceback.format_exc())
-                break
-            finally:
-                offset += page_size
-                page += 1
+                    if json:
+                        result = result.json()
+                    yield result
+                except Exception:
+                    log.warning(f'Error in api_page_iter() for url: "{new_url}"')
+                    log.trace(traceback.format_exc())
+                    break
+                finally:
+                    offset += page_size
+                    page += 1
+        finally:
+            for _, task in pending:
+                task.cancel()
+            # wait for the cancelled requests so their connections are closed now, not at garbage collection
+            await asyncio.gather(*(t for _, t in pending), return_exceptions=True)
 
     async def curl(self, *args, **kwargs):
         """
@@ -421,6 +496,10 @@ class WebHelper:
         This function constructs and executes a cURL command based on the provided parameters.
         It offers support for various cURL options such as headers, post data, and cookies.
 
+        Requests that don't need cURL's raw request features (`raw_path`, `path_override`, or
+        duplicate headers) are sent in-process with httpx instead, which avoids spawning a
+        subprocess and reuses connections. The output is the same either way.
+
         Args:
             *args: Variable length argument list for positional arguments. Unused in this function.
             url (str): The URL for the cURL request. Mandatory.
@@ -464,44 +543,46 @@ class WebHelper:
 
         ignore_bbot_global_settings = kwargs.get("ignore_bbot_global_settings", False)
 
+        timeout = None
         if ignore_bbot_global_settings:
             log.debug("ignore_bbot_global_settings enabled. Global settings will not be applied")
         else:
-            http_timeout = self.parent_helper.config.get("http_timeout", 20)
-            user_agent = self.parent_helper.config.get("user_agent", "BBOT")
-
             if "User-Agent" not in headers:
-                headers["User-Agent"] = user_agent
+                headers["User-Agent"] = self.user_agent
 
             # only add custom headers if the URL is in-scope
-            if self.parent_helper.scan.in_scope(url):
-                for hk, hv in self.parent_helper.scan.config.get("http_headers", {}).items():
+            if self.http_headers and self.parent_helper.scan.in_scope(url):
+                for hk, hv in self.http_headers.items():
                     headers[hk] = hv
 
             # add the timeout
-            if not "timeout" in kwargs:
-                timeout = http_timeout
+            timeout = kwargs.get("timeout", self.http_timeout)
 
             curl_command.append("-m")
             curl_command.append(str(timeout))
 
+        header_list = []
         for k, v in headers.items():
             if isinstance(v, list):
                 for x in v:
                     curl_command.append("-H")
                     curl_command.append(f"{k}: {x}")
+                    header_list.append((k, x))
 
             else:
                 curl_command.append("-H")
                 curl_command.append(f"{k}: {v}")
+                header_list.append((k, v))
+
+        # curl joins multiple -d arguments with "&"
+        body = []
 
         post_data = kwargs.get("post_data", {})
         if len(post_data.items()) > 0:
             curl_command.append("-d")
-            post_data_str = ""
-            for k, v in post_data.items():
-                post_data_str += f"&{k}={v}"
-            curl_command.append(post_data_str.lstrip("&"))
+            post_data_str = "&".join(f"{k}={v}" for k, v in post_data.items())
+            curl_command.append(post_data_str)
+            body.append(post_data_str)
 
         method = kwargs.get("method", "")
         if method:
@@ -509,12 +590,11 @@ class WebHelper:
             curl_command.append(method)
 
         cookies = kwargs.get("cookies", "")
+        cookies_str = ""
         if cookies:
             curl_command.append("-b")
-            cookies_str = ""
-            for k, v in cookies.items():
-                cookies_str += f"{k}={v}; "
-            curl_command.append(f'{cookies_str.rstrip(" ")}')
+            cookies_str = "".join(f"{k}={v}; " for k, v in cookies.items()).rstrip(" ")
+            curl_command.append(cookies_str)
 
         path_override = kwargs.get("path_override", None)
         if path_override:
@@ -529,10 +609,54 @@ class WebHelper:
         if raw_body:
             curl_command.append("-d")
             curl_command.append(raw_body)
+            body.append(raw_body)
+
+        # httpx normalizes paths and won't send duplicate headers, so those requests still need curl
+        header_names = [k.lower() for k, v in header_list]
+        needs_curl = raw_path or path_override or len(header_names) != len(set(header_names))
+        if not needs_curl:
+            if not method:
+                method = "HEAD" if head_mode else ("POST" if body else "GET")
+            if body and "content-type" not in header_names:
+                header_list.append(("Content-Type", "application/x-www-form-urlencoded"))
+            if cookies_str:
+                header_list.append(("Cookie", cookies_str))
+            client = self._curl_client()
+            try:
+                request = client.build_request(
+                    method, url, headers=header_list, content="&".join(body) if body else None, timeout=timeout
+                )
+            except (httpx.InvalidURL, httpx.UnsupportedProtocol, ValueError) as e:
+                log.debug(f"Falling back to cURL for {url}: {e}")
+            else:
+                response = None
+                async with self._acatch(url, raise_error=False):
+                    response = await client.send(request)
+                if response is None:
+                    return ""
+                if head_mode:
+                    status_line = f"{response.http_version} {response.status_code} {response.reason_phrase}"
+                    header_lines = [f"{k.decode()}: {v.decode()}" for k, v in response.headers.raw]
+                    return "\r\n".join([status_line] + header_lines) + "\r\n\r\n"
+                return response.text
 
         output = (await self.parent_helper.run(curl_command)).stdout
         return output
 
+    def _curl_client(self):
+        """
+        A plain httpx client for `curl()`, which handles headers, timeouts etc. itself.
+        Like cURL, it doesn't follow redirects, keep cookies, or use the scan's proxy, and it sends the same
+        default headers.
+        """
+        if self._curl_httpx_client is None:
+            client = httpx.AsyncClient(verify=self.ssl_verify, follow_redirects=False, cookies=DummyCookies())
+            # replace httpx's default headers (User-Agent, Accept-Encoding, Connection) with the ones cURL sends
+            client.headers.clear()
+            client.headers.update({"User-Agent": "curl/7.88.1", "Accept": "*/*"})
+            self._curl_httpx_client = client
+        return self._curl_httpx_client
+
     def is_spider_danger(self, source_event, url):
         """
         Determines whether visiting a URL could potentially trigger a web-spider-like happening.
@@ -559,10 +683,8 @@ class WebHelper:
             False
         """
         url_depth = self.parent_helper.url_depth(url)
-        web_spider_depth = self.parent_helper.scan.config.get("web_spider_depth", 1)
         spider_distance = getattr(source_event, "web_spider_distance", 0) + 1
-        web_spider_distance = self.parent_helper.scan.config.get("web_spider_distance", 0)
-        if (url_depth > web_spider_depth) or (spider_distance > web_spider_distance):
+        if (url_depth > self.web_spider_depth) or (spider_distance > self.web_spider_distance):
             return True
         return False
 
@@ -1,5 +1,6 @@
 import re
 import csv
+import heapq
 import string
 import logging
 import wordninja
@@ -432,7 +433,8 @@ class Mutator(dict):
 
     def top_mutations(self, n=None):
         if n is not None:
-            return dict(sorted(self.items(), key=lambda x: x[-1], reverse=True)[:n])
+            # same result as sorting everything and slicing, without sorting the whole mutation table
+            return dict(heapq.nlargest(n, self.items(), key=lambda x: x[-1]))
         else:
             return dict(self)
 
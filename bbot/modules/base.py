@@ -1,7 +1,7 @@
 import asyncio
 import logging
-import traceback
 from sys import exc_info
+from itertools import chain
 from contextlib import suppress
 
 from ..core.helpers.misc import get_size  # noqa
@@ -123,16 +123,18 @@ class BaseModule:
         self.scan = scan
         self.errored = False
         self._log = None
+        self._config = None
+        # reused by the logging helpers
+        self._log_extra = {"scan_id": scan.id}
         self._incoming_event_queue = None
         self._outgoing_event_queue = None
         # track incoming events to prevent unwanted duplicates
         self._incoming_dup_tracker = set()
-        # seconds since we've submitted a batch
-        self._last_submitted_batch = None
         # additional callbacks to be executed alongside self.cleanup()
         self.cleanup_callbacks = []
         self._cleanedup = False
         self._watched_events = None
+        self._clamped_priority = None
 
         self._task_counter = TaskCounter()
 
@@ -143,8 +145,10 @@ class BaseModule:
         self._request_failures = 0
 
         self._tasks = []
-        self._event_received = asyncio.Condition()
-        self._event_queued = asyncio.Condition()
+        # set whenever an event is queued (wakes up batch workers)
+        self._event_received = asyncio.Event()
+        # set by the manager whenever it takes an event off our outgoing queue
+        self._event_dequeued = asyncio.Event()
 
         # used for optional "per host" tracking
         self._per_host_tracker = set()
@@ -326,10 +330,10 @@ class BaseModule:
         Override this method if the set of events the module should watch needs to be determined dynamically, e.g., based on configuration options or other runtime conditions.
 
         Returns:
-            set: The set of event types that this module will handle.
+            frozenset: The set of event types that this module will handle.
         """
         if self._watched_events is None:
-            self._watched_events = set(self.watched_events)
+            self._watched_events = frozenset(self.watched_events)
         return self._watched_events
 
     async def _handle_batch(self):
@@ -395,7 +399,8 @@ class BaseModule:
         except ValidationError as e:
             if raise_error:
                 raise
-            self.warning(f"{e}")
+            # the message says it all; rendering a traceback for every rejected candidate is expensive
+            self.warning(f"{e}", trace=False)
             return
         if not event.module:
             event.module = self
@@ -457,9 +462,18 @@ class BaseModule:
             emit_event: For emitting an event without waiting on the queue size.
         """
         while self.outgoing_event_queue.qsize() > self._qsize:
-            await self.helpers.sleep(0.2)
+            await self._wait_for_dequeue()
         return self.emit_event(*args, **kwargs)
 
+    async def _wait_for_dequeue(self):
+        """
+        Sleeps until the manager pulls an event off our outgoing queue.
+
+        Used for backpressure when `_qsize` is set, in place of polling the queue size.
+        """
+        self._event_dequeued.clear()
+        await self._event_dequeued.wait()
+
     async def _events_waiting(self):
         """
         Asynchronously fetches events from the incoming_event_queue, up to a specified batch size.
@@ -473,43 +487,47 @@ class BaseModule:
                 - finish (bool): A flag indicating if a "FINISHED" event is encountered.
 
         Notes:
-            - The method pulls events from incoming_event_queue using 'get_nowait()'.
+            - The method pulls events from incoming_event_queue in bulk using 'drain()'.
             - Events go through '_event_postcheck()' for validation.
             - "FINISHED" events are handled differently and the finish flag is set to True.
             - If the queue is empty or the batch size is reached, the loop breaks.
         """
         events = []
         finish = False
-        while self.incoming_event_queue:
-            if len(events) > self.batch_size:
+        batch_size = self.batch_size
+        event_postcheck = self._event_postcheck
+        event_consumed = self.scan.stats.event_consumed
+        # stringifying every event adds up on big batches, so only do it if it's going to be logged
+        debug = self.log.isEnabledFor(logging.DEBUG)
+        while self.incoming_event_queue and len(events) < batch_size:
+            batch = self.incoming_event_queue.drain(batch_size - len(events))
+            if not batch:
                 break
-            try:
-                event = self.incoming_event_queue.get_nowait()
-                self.debug(f"Got {event} from {getattr(event, 'module', 'unknown_module')}")
-                acceptable, reason = await self._event_postcheck(event)
+            for event in batch:
+                if debug:
+                    self.debug(f"Got {event} from {getattr(event, 'module', 'unknown_module')}")
+                acceptable, reason = await event_postcheck(event)
                 if acceptable:
                     if event.type == "FINISHED":
                         finish = True
                     else:
                         events.append(event)
-                        self.scan.stats.event_consumed(event, self)
-                elif reason:
+                        event_consumed(event, self)
+                elif reason and debug:
                     self.debug(f"Not accepting {event} because {reason}")
-            except asyncio.queues.QueueEmpty:
-                break
         return events, finish
 
     @property
     def num_incoming_events(self):
-        ret = 0
-        if self.incoming_event_queue is not False:
-            ret = self.incoming_event_queue.qsize()
-        return ret
+        incoming_event_queue = self.incoming_event_queue
+        if incoming_event_queue is False:
+            return 0
+        return incoming_event_queue.qsize()
 
     def start(self):
-        self._tasks = [
-            asyncio.create_task(self._worker(), name=f"{self.name}._worker()") for _ in range(self.max_event_handlers)
-        ]
+        # workers are lightweight asyncio tasks on the scan's event loop, not threads
+        task_name = f"{self.name}._worker()"
+        self._tasks = [asyncio.create_task(self._worker(), name=task_name) for _ in range(self.max_event_handlers)]
 
     async def _setup(self):
         """
@@ -576,48 +594,60 @@ class BaseModule:
             - Each event is subject to a post-check via '_event_postcheck()' to decide whether it should be handled.
             - Special 'FINISHED' events trigger the 'finish()' method of the module.
         """
-        async with self.scan._acatch(context=self._worker):
+        # hoist attribute lookups out of the loop
+        scan = self.scan
+        name = self.name
+        task_counter = self._task_counter
+        event_received = self._event_received
+        batch_size = self.batch_size
+        async with scan._acatch(context=self._worker):
             try:
-                while not self.scan.stopping and not self.errored:
+                while not scan.stopping and not self.errored:
                     # hold the reigns if our outgoing queue is full
                     if self._qsize > 0 and self.outgoing_event_queue.qsize() >= self._qsize:
-                        await asyncio.sleep(0.1)
+                        await self._wait_for_dequeue()
                         continue
 
-                    if self.batch_size > 1:
+                    if batch_size > 1:
+                        # clear before draining so that events queued in the meantime still wake us up
+                        event_received.clear()
                         submitted = await self._handle_batch()
                         if not submitted:
-                            async with self._event_received:
-                                await self._event_received.wait()
+                            await event_received.wait()
 
                     else:
                         try:
-                            if self.incoming_event_queue is not False:
-                                event = await self.incoming_event_queue.get()
+                            incoming_event_queue = self.incoming_event_queue
+                            if incoming_event_queue is not False:
+                                event = await incoming_event_queue.get()
                             else:
                                 self.debug(f"Event queue is in bad state")
                                 break
                         except asyncio.queues.QueueEmpty:
                             continue
-                        self.debug(f"Got {event} from {getattr(event, 'module', 'unknown_module')}")
-                        async with self._task_counter.count(f"event_postcheck({event})"):
+                        # skip formatting the per-event debug messages unless they're going to be logged
+                        debug = self.log.isEnabledFor(logging.DEBUG)
+                        if debug:
+                            self.debug(f"Got {event} from {getattr(event, 'module', 'unknown_module')}")
+                        async with task_counter.count(f"event_postcheck({event})"):
                             acceptable, reason = await self._event_postcheck(event)
                         if acceptable:
                             if event.type == "FINISHED":
-                                context = f"{self.name}.finish()"
-                                async with self.scan._acatch(context), self._task_counter.count(context):
+                                context = f"{name}.finish()"
+                                async with scan._acatch(context), task_counter.count(context):
                                     finish_task = asyncio.create_task(self.finish())
                                     await finish_task
                             else:
-                                context = f"{self.name}.handle_event({event})"
-                                self.scan.stats.event_consumed(event, self)
-                                self.debug(f"Handling {event}")
-                                async with self.scan._acatch(context), self._task_counter.count(context):
-                                    task_name = f"{self.name}.handle_event({event})"
-                                    handle_event_task = asyncio.create_task(self.handle_event(event), name=task_name)
+                                context = f"{name}.handle_event({event})"
+                                scan.stats.event_consumed(event, self)
+                                if debug:
+                                    self.debug(f"Handling {event}")
+                                async with scan._acatch(context), task_counter.count(context):
+                                    handle_event_task = asyncio.create_task(self.handle_event(event), name=context)
                                     await handle_event_task
-                                self.debug(f"Finished handling {event}")
-                        else:
+                                if debug:
+                                    self.debug(f"Finished handling {event}")
+                        elif debug:
                             self.debug(f"Not accepting {event} because {reason}")
             except asyncio.CancelledError:
                 self.log.trace("Worker cancelled")
@@ -659,19 +689,21 @@ class BaseModule:
             - Applies specific filtering based on event type and module name.
         """
 
+        event_type = event.type
         # special signal event types
-        if event.type in ("FINISHED",):
+        if event_type == "FINISHED":
             return True, "its type is FINISHED"
         if self.errored:
             return False, f"module is in error state"
         # exclude non-watched types
-        if not any(t in self.get_watched_events() for t in ("*", event.type)):
+        watched_events = self.get_watched_events()
+        if not ("*" in watched_events or event_type in watched_events):
             return False, "its type is not in watched_events"
         if self.target_only:
             if "target" not in event.tags:
                 return False, "it did not meet target_only filter criteria"
         # exclude certain URLs (e.g. javascript):
-        if event.type.startswith("URL") and self.name != "httpx" and "httpx-only" in event.tags:
+        if event_type.startswith("URL") and "httpx-only" in event.tags and self.name != "httpx":
             return False, "its extension was listed in url_extension_httpx_only"
 
         return True, "precheck succeeded"
@@ -685,7 +717,9 @@ class BaseModule:
             # check duplicates
             is_incoming_duplicate, reason = self.is_incoming_duplicate(event, add=True)
             if is_incoming_duplicate and not self.accept_dupes:
-                return False, f"module has already seen {event}" + (f" ({reason})" if reason else "")
+                # only stringify the event if the reason is actually going to be logged
+                seen = event if self.log.isEnabledFor(logging.DEBUG) else "this event"
+                return False, f"module has already seen {seen}" + (f" ({reason})" if reason else "")
 
         return acceptable, reason
 
@@ -730,39 +764,45 @@ class BaseModule:
         # custom filtering
         async with self.scan._acatch(context=self.filter_event):
             filter_result = await self.filter_event(event)
-            msg = str(self._custom_filter_criteria_msg)
+            msg_suffix = ""
             with suppress(ValueError, TypeError):
                 filter_result, reason = filter_result
-                msg += f": {reason}"
+                msg_suffix = f": {reason}"
             if not filter_result:
-                return False, msg
+                return False, f"{self._custom_filter_criteria_msg}{msg_suffix}"
 
         if self._type == "output" and not event._stats_recorded:
             event._stats_recorded = True
             self.scan.stats.event_produced(event)
 
-        self.debug(f"{event} passed post-check")
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.debug(f"{event} passed post-check")
         return True, ""
 
     def _scope_distance_check(self, event):
+        scope_distance = event.scope_distance
         if self.in_scope_only:
-            if event.scope_distance > 0:
+            if scope_distance > 0:
                 return False, "it did not meet in_scope_only filter criteria"
         if self.scope_distance_modifier is not None:
-            if event.scope_distance < 0:
-                return False, f"its scope_distance ({event.scope_distance}) is invalid."
-            elif event.scope_distance > self.max_scope_distance:
+            if scope_distance < 0:
+                return False, f"its scope_distance ({scope_distance}) is invalid."
+            max_scope_distance = self.max_scope_distance
+            if scope_distance > max_scope_distance:
+                # the full explanation is only worth building if it's going to be logged
+                if not self.log.isEnabledFor(logging.DEBUG):
+                    return False, f"its scope_distance ({scope_distance}) exceeds the maximum ({max_scope_distance})"
                 return (
                     False,
-                    f"its scope_distance ({event.scope_distance}) exceeds the maximum allowed by the scan ({self.scan.scope_search_distance}) + the module ({self.scope_distance_modifier}) == {self.max_scope_distance}",
+                    f"its scope_distance ({scope_distance}) exceeds the maximum allowed by the scan ({self.scan.scope_search_distance}) + the module ({self.scope_distance_modifier}) == {max_scope_distance}",
                 )
         return True, ""
 
     async def _cleanup(self):
         if not self._cleanedup:
             self._cleanedup = True
-            for callback in [self.cleanup] + self.cleanup_callbacks:
-                context = f"{self.name}.cleanup()"
+            context = f"{self.name}.cleanup()"
+            for callback in chain((self.cleanup,), self.cleanup_callbacks):
                 if callable(callback):
                     async with self.scan._acatch(context), self._task_counter.count(context):
                         await self.helpers.execute_sync_or_async(callback)
@@ -787,22 +827,25 @@ class BaseModule:
             AttributeError: If the module is not in an acceptable state to queue incoming events.
         """
         async with self._task_counter.count("queue_event()", _log=False):
-            if self.incoming_event_queue is False:
+            incoming_event_queue = self.incoming_event_queue
+            if incoming_event_queue is False:
                 self.debug(f"Not in an acceptable state to queue incoming event")
                 return
             acceptable, reason = True, "precheck was skipped"
             if precheck:
                 acceptable, reason = self._event_precheck(event)
+                # the scope distance check is left to _event_postcheck(), since an event's scope distance
+                # can still drop (e.g. when one of its children is found to be closer) while it waits in the queue
+            debug = self.log.isEnabledFor(logging.DEBUG)
             if not acceptable:
-                if reason and reason != "its type is not in watched_events":
+                if debug and reason and reason != "its type is not in watched_events":
                     self.debug(f"Not queueing {event} because {reason}")
                 return
-            else:
+            elif debug:
                 self.debug(f"Queueing {event} because {reason}")
             try:
-                self.incoming_event_queue.put_nowait(event)
-                async with self._event_received:
-                    self._event_received.notify()
+                incoming_event_queue.put_nowait(event)
+                self._event_received.set()
                 if event.type != "FINISHED":
                     self.scan.manager._new_activity = True
             except AttributeError:
@@ -830,6 +873,7 @@ class BaseModule:
         """
         try:
             self.outgoing_event_queue.put_nowait((event, kwargs))
+            self.scan.manager._event_queued.set()
         except AttributeError:
             self.debug(f"Not in an acceptable state to queue outgoing event")
 
@@ -863,17 +907,14 @@ class BaseModule:
             # clear incoming queue
             if self.incoming_event_queue is not False:
                 self.debug(f"Emptying event_queue")
-                with suppress(asyncio.queues.QueueEmpty):
-                    while 1:
-                        self.incoming_event_queue.get_nowait()
+                self.incoming_event_queue.clear()
                 # set queue to None to prevent its use
                 # if there are leftover objects in the queue, the scan will hang.
                 self._incoming_event_queue = False
 
             if clear_outgoing_queue:
-                with suppress(asyncio.queues.QueueEmpty):
-                    while 1:
-                        self.outgoing_event_queue.get_nowait()
+                self.outgoing_event_queue.clear()
+                self._event_dequeued.set()
 
     def is_incoming_duplicate(self, event, add=False):
         if event.type in ("FINISHED",):
@@ -992,13 +1033,14 @@ class BaseModule:
             >>> self.status
             {'events': {'incoming': 5, 'outgoing': 2}, 'tasks': 3, 'errored': False, 'running': True}
         """
-        status = {
+        # same check as self.running, without counting the tasks twice
+        tasks = self._task_counter.value
+        return {
             "events": {"incoming": self.num_incoming_events, "outgoing": self.outgoing_event_queue.qsize()},
-            "tasks": self._task_counter.value,
+            "tasks": tasks,
             "errored": self.errored,
+            "running": tasks > 0,
         }
-        status["running"] = self.running
-        return status
 
     @property
     def running(self):
@@ -1062,10 +1104,13 @@ class BaseModule:
         Returns:
             dict: The configuration dictionary specific to this module.
         """
-        config = self.scan.config.get("modules", {}).get(self.name, {})
-        if config is None:
-            config = {}
-        return config
+        # cached, since it's read on every event (e.g. preserve_graph, batch_size)
+        if self._config is None:
+            config = self.scan.config.get("modules", {}).get(self.name, {})
+            if config is None:
+                config = {}
+            self._config = config
+        return self._config
 
     @property
     def incoming_event_queue(self):
@@ -1086,6 +1131,7 @@ class BaseModule:
 
         The priority level is constrained to be between 1 and 5, inclusive.
         A lower value indicates a higher priority.
+        The constrained value is cached; assign to `priority` (not `_priority`) to change it.
 
         Returns:
             int: The priority level of the module, constrained between 1 and 5.
@@ -1094,7 +1140,14 @@ class BaseModule:
             >>> self.priority
             3
         """
-        return int(max(1, min(5, self._priority)))
+        if self._clamped_priority is None:
+            self._clamped_priority = int(max(1, min(5, self._priority)))
+        return self._clamped_priority
+
+    @priority.setter
+    def priority(self, priority):
+        self._priority = priority
+        self._clamped_priority = None
 
     @property
     def auth_required(self):
@@ -1109,7 +1162,7 @@ class BaseModule:
 
     @property
     def log(self):
-        if getattr(self, "_log", None) is None:
+        if self._log is None:
             self._log = logging.getLogger(f"bbot.modules.{self.name}")
         return self._log
 
@@ -1160,7 +1213,8 @@ class BaseModule:
         return table
 
     def _is_graph_important(self, event):
-        return self.preserve_graph and getattr(event, "_graph_important", False)
+        # most events aren't graph-important, so check that before looking up the config
+        return getattr(event, "_graph_important", False) and self.preserve_graph
 
     @property
     def preserve_graph(self):
@@ -1181,7 +1235,7 @@ class BaseModule:
         Examples:
             >>> self.stdout("This will be printed to stdout")
         """
-        self.log.stdout(*args, extra={"scan_id": self.scan.id}, **kwargs)
+        self.log.stdout(*args, extra=self._log_extra, **kwargs)
 
     def debug(self, *args, trace=False, **kwargs):
         """Logs debug messages and optionally the stack trace of the most recent exception.
@@ -1195,7 +1249,7 @@ class BaseModule:
             >>> self.debug("This is a debug message")
             >>> self.debug("This is a debug message with a trace", trace=True)
         """
-        self.log.debug(*args, extra={"scan_id": self.scan.id}, **kwargs)
+        self.log.debug(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
@@ -1211,7 +1265,7 @@ class BaseModule:
             >>> self.verbose("This is a verbose message")
             >>> self.verbose("This is a verbose message with a trace", trace=True)
         """
-        self.log.verbose(*args, extra={"scan_id": self.scan.id}, **kwargs)
+        self.log.verbose(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
@@ -1227,7 +1281,7 @@ class BaseModule:
             >>> self.hugeverbose("This is a huge verbose message")
             >>> self.hugeverbose("This is a huge verbose message with a trace", trace=True)
         """
-        self.log.hugeverbose(*args, extra={"scan_id": self.scan.id}, **kwargs)
+        self.log.hugeverbose(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
@@ -1243,7 +1297,7 @@ class BaseModule:
             >>> self.info("This is an informational message")
             >>> self.info("This is an informational message with a trace", trace=True)
         """
-        self.log.info(*args, extra={"scan_id": self.scan.id}, **kwargs)
+        self.log.info(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
@@ -1259,7 +1313,7 @@ class BaseModule:
             >>> self.hugeinfo("This is a huge informational message")
             >>> self.hugeinfo("This is a huge informational message with a trace", trace=True)
         """
-        self.log.hugeinfo(*args, extra={"scan_id": self.scan.id}, **kwargs)
+        self.log.hugeinfo(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
@@ -1275,7 +1329,7 @@ class BaseModule:
             >>> self.success("Operation completed successfully")
             >>> self.success("Operation completed with a trace", trace=True)
         """
-        self.log.success(*args, extra={"scan_id": self.scan.id}, **kwargs)
+        self.log.success(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
@@ -1291,7 +1345,7 @@ class BaseModule:
             >>> self.hugesuccess("This is a huge success message")
             >>> self.hugesuccess("This is a huge success message with a trace", trace=True)
         """
-        self.log.hugesuccess(*args, extra={"scan_id": self.scan.id}, **kwargs)
+        self.log.hugesuccess(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
@@ -1307,7 +1361,7 @@ class BaseModule:
             >>> self.warning("This is a warning message")
             >>> self.warning("This is a warning message with a trace", trace=False)
         """
-        self.log.warning(*args, extra={"scan_id": self.scan.id}, **kwargs)
+        self.log.warning(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
@@ -1323,7 +1377,7 @@ class BaseModule:
             >>> self.hugewarning("This is a huge warning message")
             >>> self.hugewarning("This is a huge warning message with a trace", trace=False)
         """
-        self.log.hugewarning(*args, extra={"scan_id": self.scan.id}, **kwargs)
+        self.log.hugewarning(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
@@ -1339,7 +1393,7 @@ class BaseModule:
             >>> self.error("This is an error message")
             >>> self.error("This is an error message with a trace", trace=False)
         """
-        self.log.error(*args, extra={"scan_id": self.scan.id}, **kwargs)
+        self.log.error(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
@@ -1356,9 +1410,12 @@ class BaseModule:
             >>> except ZeroDivisionError:
             >>>     self.trace()
         """
+        if not self.log.isEnabledFor(logging.TRACE):
+            return
         e_type, e_val, e_traceback = exc_info()
         if e_type is not None:
-            self.log.trace(traceback.format_exc())
+            # let the handlers render the traceback, and only if they actually emit the record
+            self.log.trace(f"{e_type.__name__}: {e_val}", exc_info=(e_type, e_val, e_traceback))
 
     def critical(self, *args, trace=True, **kwargs):
         """Logs a whole message in emboldened red text, and optionally the stack trace of the most recent exception.
@@ -1372,6 +1429,6 @@ class BaseModule:
             >>> self.critical("This is a critical message")
             >>> self.critical("This is a critical message with a trace", trace=False)
         """
-        self.log.critical(*args, extra={"scan_id": self.scan.id}, **kwargs)
+        self.log.critical(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
@@ -5,6 +5,8 @@ import string
 from bbot.modules.deadly.ffuf import ffuf
 from bbot.core.helpers.misc import parse_list_string
 
+tilde_number_regex = re.compile(r"~\d")
+
 
 def find_common_prefixes(strings, minimum_set_length=4):
     prefix_candidates = [s[:i] for s in strings if len(s) == 6 for i in range(3, 6)]
@@ -127,7 +129,7 @@ class ffuf_shortnames(ffuf):
 
     async def handle_event(self, event):
         if event.source.type == "URL":
-            filename_hint = re.sub(r"~\d", "", event.parsed.path.rsplit(".", 1)[0].split("/")[-1]).lower()
+            filename_hint = tilde_number_regex.sub("", event.parsed.path.rsplit(".", 1)[0].split("/")[-1]).lower()
 
             host = f"{event.source.parsed.scheme}://{event.source.parsed.netloc}/"
             if host not in self.per_host_collection.keys():
@@ -4,6 +4,8 @@ from bbot.modules.base import BaseModule
 
 valid_chars = "ETAONRISHDLFCMUGYPWBVKJXQZ0123456789_-$~()&!#%'@^`{}]]"
 
+tilde_number_regex = re.compile(r"~\d")
+
 
 def encode_all(string):
     return "".join("%{0:0>2}".format(format(ord(char), "x")) for char in string)
@@ -72,7 +74,7 @@ class iis_shortnames(BaseModule):
     async def duplicate_check(self, target, method, url_hint, affirmative_status_code):
         duplicates = []
         count = 2
-        base_hint = re.sub(r"~\d", "", url_hint)
+        base_hint = tilde_number_regex.sub("", url_hint)
         suffix = "/a.aspx"
 
         while 1:
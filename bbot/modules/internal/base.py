@@ -11,10 +11,12 @@ class BaseInternalModule(BaseModule):
 
     @property
     def config(self):
-        config = self.scan.config.get("internal_modules", {}).get(self.name, {})
-        if config is None:
-            config = {}
-        return config
+        if self._config is None:
+            config = self.scan.config.get("internal_modules", {}).get(self.name, {})
+            if config is None:
+                config = {}
+            self._config = config
+        return self._config
 
     @property
     def log(self):
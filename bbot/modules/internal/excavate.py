@@ -4,7 +4,7 @@ import base64
 import jwt as j
 from urllib.parse import urljoin
 
-from bbot.core.helpers.regexes import _email_regex, dns_name_regex
+from bbot.core.helpers.regexes import email_regex, dns_name_regex
 from bbot.modules.internal.base import BaseInternalModule
 
 
@@ -58,8 +58,8 @@ class HostnameExtractor(BaseExtractor):
     regexes = {}
 
     def __init__(self, excavate):
-        for i, r in enumerate(excavate.scan.dns_regexes):
-            self.regexes[f"dns_name_{i+1}"] = r.pattern
+        # the scan's regexes are already compiled, so use them as-is instead of recompiling their patterns
+        self.regexes = {f"dns_name_{i+1}": r for i, r in enumerate(excavate.scan.dns_regexes)}
         super().__init__(excavate)
 
     def report(self, result, name, event, **kwargs):
@@ -189,7 +189,8 @@ class URLExtractor(BaseExtractor):
 
 
 class EmailExtractor(BaseExtractor):
-    regexes = {"email": _email_regex}
+    # already compiled, so re.compile() hands back the same object instead of building a second one
+    regexes = {"email": email_regex}
     tld_blacklist = ["png", "jpg", "jpeg", "bmp", "ico", "gif", "svg", "css", "ttf", "woff", "woff2"]
 
     def report(self, result, name, event, **kwargs):
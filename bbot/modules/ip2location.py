@@ -18,11 +18,13 @@ class IP2Location(BaseModule):
     scope_distance_modifier = 1
     _priority = 2
     suppress_dupes = False
+    _batch_size = 100
 
     base_url = "http://api.ip2location.io"
 
     async def setup(self):
         self.lang = self.config.get("lang", "")
+        self._url_parts = None
         return await self.require_api_key()
 
     async def ping(self):
@@ -32,29 +34,39 @@ class IP2Location(BaseModule):
         assert getattr(r, "status_code", 0) == 200, resp_content
 
     def build_url(self, data):
-        url = f"{self.base_url}/?key={self.api_key}&ip={data}&format=json&source=bbot"
-        if self.lang:
-            url = f"{url}&lang={self.lang}"
-        return url
+        # everything but the IP is the same for every request, so only build that part once
+        if self._url_parts is None:
+            suffix = "&format=json&source=bbot"
+            if self.lang:
+                suffix = f"{suffix}&lang={self.lang}"
+            self._url_parts = (f"{self.base_url}/?key={self.api_key}&ip=", suffix)
+        prefix, suffix = self._url_parts
+        return f"{prefix}{data}{suffix}"
 
-    async def handle_event(self, event):
+    async def handle_batch(self, *events):
+        # one request per IP, but the whole batch is in flight at once (over the shared connection pool)
+        results = await self.helpers.gather(*[self.query(event) for event in events])
+        for event, geo_data in zip(events, results):
+            if not geo_data:
+                continue
+            geo_data = {k: v for k, v in geo_data.items() if v is not None}
+            if "error" in geo_data:
+                error_msg = geo_data.get("error").get("error_message", "")
+                if error_msg:
+                    self.warning(error_msg)
+            elif geo_data:
+                self.emit_event(geo_data, "GEOLOCATION", event)
+
+    async def query(self, event):
+        url = self.build_url(event.data)
         try:
-            url = self.build_url(event.data)
             result = await self.request_with_fail_count(url)
             if result:
                 geo_data = result.json()
                 if not geo_data:
                     self.verbose(f"No JSON response from {url}")
+                return geo_data
             else:
                 self.verbose(f"No response from {url}")
         except Exception:
             self.verbose(f"Error retrieving results for {event.data}", trace=True)
-            return
-
-        geo_data = {k: v for k, v in geo_data.items() if v is not None}
-        if "error" in geo_data:
-            error_msg = geo_data.get("error").get("error_message", "")
-            if error_msg:
-                self.warning(error_msg)
-        elif geo_data:
-            self.emit_event(geo_data, "GEOLOCATION", event)
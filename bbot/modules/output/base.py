@@ -10,19 +10,21 @@ class BaseOutputModule(BaseModule):
     _stats_exclude = True
 
     def _event_precheck(self, event):
+        event_type = event.type
         # special signal event types
-        if event.type in ("FINISHED",):
+        if event_type == "FINISHED":
             return True, "its type is FINISHED"
         if self.errored:
             return False, f"module is in error state"
         # exclude non-watched types
-        if not any(t in self.get_watched_events() for t in ("*", event.type)):
+        watched_events = self.get_watched_events()
+        if not ("*" in watched_events or event_type in watched_events):
             return False, "its type is not in watched_events"
         if self.target_only:
             if "target" not in event.tags:
                 return False, "it did not meet target_only filter criteria"
         # exclude certain URLs (e.g. javascript):
-        if event.type.startswith("URL") and self.name != "httpx" and "httpx-only" in event.tags:
+        if event_type.startswith("URL") and self.name != "httpx" and "httpx-only" in event.tags:
             return False, "its extension was listed in url_extension_httpx_only"
 
         # output module specific stuff
@@ -68,10 +70,12 @@ class BaseOutputModule(BaseModule):
 
     @property
     def config(self):
-        config = self.scan.config.get("output_modules", {}).get(self.name, {})
-        if config is None:
-            config = {}
-        return config
+        if self._config is None:
+            config = self.scan.config.get("output_modules", {}).get(self.name, {})
+            if config is None:
+                config = {}
+            self._config = config
+        return self._config
 
     @property
     def log(self):
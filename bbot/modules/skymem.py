@@ -2,6 +2,8 @@ import re
 
 from .emailformat import emailformat
 
+domain_id_regex = re.compile(r'<a href="/domain/([a-z0-9]+)\?p=', re.I)
+
 
 class skymem(emailformat):
     watched_events = ["DNS_NAME"]
@@ -22,17 +24,18 @@ class skymem(emailformat):
             self.emit_event(email, "EMAIL_ADDRESS", source=event)
 
         # iterate through other pages
-        domain_ids = re.findall(r'<a href="/domain/([a-z0-9]+)\?p=', r.text, re.I)
+        domain_ids = domain_id_regex.findall(r.text)
         if not domain_ids:
             return
         domain_id = domain_ids[0]
+        page_regex = re.compile(r"/domain/" + domain_id + r"\?p=(\d+)")
         for page in range(2, 22):
             r2 = await self.request_with_fail_count(f"{self.base_url}/domain/{domain_id}?p={page}")
             if not r2:
                 continue
             for email in self.helpers.extract_emails(r2.text):
                 self.emit_event(email, "EMAIL_ADDRESS", source=event)
-            pages = re.findall(r"/domain/" + domain_id + r"\?p=(\d+)", r2.text)
+            pages = page_regex.findall(r2.text)
             if not pages:
                 break
             last_page = max([int(p) for p in pages])
@@ -1,3 +1,4 @@
+import bisect
 import ipaddress
 
 from bbot.modules.base import BaseModule
@@ -10,6 +11,7 @@ class portscanner(BaseModule):
 
     async def setup(self):
         self.ip_ranges = [e.host for e in self.scan.target.events if e.type == "IP_RANGE"]
+        self._build_ip_range_index()
         exclude, invalid_exclude = self._build_targets(self.scan.blacklist)
         if not exclude:
             exclude = ["255.255.255.255/32"]
@@ -33,23 +35,51 @@ class portscanner(BaseModule):
         asset_inventory_config = getattr(asset_inventory_module, "config", {})
         asset_inventory_use_previous = asset_inventory_config.get("use_previous", False)
         if event.type == "IP_ADDRESS" and not asset_inventory_use_previous:
-            for net in self.helpers.ip_network_parents(event.data, include_self=True):
-                if net in self.ip_ranges:
-                    return False, f"skipping {event.host} because it is already included in {net}"
+            net = self._containing_ip_range(event.host)
+            if net is not None:
+                return False, f"skipping {event.host} because it is already included in {net}"
         elif event.type == "IP_RANGE" and asset_inventory_use_previous:
             return False, f"skipping IP_RANGE {event.host} because asset_inventory.use_previous=True"
         return True
 
+    def _build_ip_range_index(self):
+        """
+        Collapses the target IP ranges into sorted, non-overlapping networks (one list per IP version)
+        so that `_containing_ip_range()` can find the one containing an IP with a single bisect
+        """
+        self._ip_range_index = {}
+        for version in (4, 6):
+            # CIDR blocks either nest or don't overlap at all, so keeping only the outermost ones leaves disjoint ranges
+            outermost = []
+            nets = sorted(
+                (n for n in self.ip_ranges if n.version == version), key=lambda n: (n.network_address, n.prefixlen)
+            )
+            for net in nets:
+                if not outermost or net.network_address > outermost[-1].broadcast_address:
+                    outermost.append(net)
+            if outermost:
+                self._ip_range_index[version] = ([int(n.network_address) for n in outermost], outermost)
+
+    def _containing_ip_range(self, ip):
+        """
+        Returns the target IP range that contains `ip`, or None if there isn't one
+        """
+        try:
+            starts, nets = self._ip_range_index[ip.version]
+        except KeyError:
+            return None
+        index = bisect.bisect_right(starts, int(ip)) - 1
+        if index >= 0 and ip in nets[index]:
+            return nets[index]
+        return None
+
     def _build_targets(self, target):
         invalid_targets = 0
         targets = []
         for t in target:
-            t = self.helpers.make_ip_type(t.data)
-            if isinstance(t, str):
-                invalid_targets += 1
+            # the event's host has already been parsed into an IP address/network, so there's no need to re-parse its data
+            if t.type in ("IP_ADDRESS", "IP_RANGE"):
+                targets.append(str(ipaddress.ip_network(t.host)))
             else:
-                if self.helpers.is_ip(t):
-                    targets.append(str(ipaddress.ip_network(t)))
-                else:
-                    targets.append(str(t))
+                invalid_targets += 1
         return targets, invalid_targets
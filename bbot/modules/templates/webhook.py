@@ -55,7 +55,7 @@ class WebhookOutputModule(BaseOutputModule):
             event_types = self.config.get("event_types", ["VULNERABILITY"])
             if isinstance(event_types, str):
                 event_types = [event_types]
-            self._watched_events = set(event_types)
+            self._watched_events = frozenset(event_types)
         return self._watched_events
 
     async def filter_event(self, event):
@@ -1,3 +1,4 @@
+import random
 import asyncio
 import logging
 import traceback
@@ -52,8 +53,11 @@ class ScanManager:
         self.dns_resolution = self.scan.config.get("dns_resolution", False)
         self._task_counter = TaskCounter()
         self._new_activity = True
+        # set whenever an event is queued for the manager (wakes up idle worker loops)
+        self._event_queued = asyncio.Event()
         self._modules_by_priority = None
         self._incoming_queues = None
+        self._queue_modules = None
         self._module_priority_weights = None
         # emit_event timeout - 5 minutes
         self._emit_event_timeout = 5 * 60
@@ -273,13 +277,14 @@ class ScanManager:
 
             # speculate DNS_NAMES and IP_ADDRESSes from other event types
             source_event = event
+            # (cheapest checks first; this runs for every event)
             if (
-                event.host
-                and event.type not in ("DNS_NAME", "DNS_NAME_UNRESOLVED", "IP_ADDRESS", "IP_RANGE")
-                and not str(event.module) == "speculate"
+                event.type not in ("DNS_NAME", "DNS_NAME_UNRESOLVED", "IP_ADDRESS", "IP_RANGE")
+                and getattr(event.module, "_name", None) != "speculate"
+                and event.host
             ):
                 source_module = self.scan.helpers._make_dummy_module("host", _type="internal")
-                source_module._priority = 4
+                source_module.priority = 4
                 source_event = self.scan.make_event(event.host, "DNS_NAME", module=source_module, source=event)
                 # only emit the event if it's not already in the parent chain
                 if source_event is not None and source_event not in source_event.get_sources():
@@ -303,7 +308,7 @@ class ScanManager:
                     if dns_children:
                         for rdtype, records in dns_children.items():
                             module = self.scan.helpers.dns._get_dummy_module(rdtype)
-                            module._priority = 4
+                            module.priority = 4
                             for record in records:
                                 try:
                                     child_event = self.scan.make_event(
@@ -323,8 +328,8 @@ class ScanManager:
                         self.queue_event(child_event)
 
         except ValidationError as e:
+            # validation failures are routine, the traceback isn't worth rendering
             log.warning(f"Event validation failed with kwargs={kwargs}: {e}")
-            log.trace(traceback.format_exc())
 
         finally:
             event._resolved.set()
@@ -411,8 +416,7 @@ class ScanManager:
             for mod in self.scan.modules.values():
                 acceptable_dup = (not is_outgoing_duplicate) or mod.accept_dupes
                 # graph_important = mod._type == "output" and event._graph_important == True
-                graph_important = mod._is_graph_important(event)
-                if acceptable_dup or graph_important:
+                if acceptable_dup or mod._is_graph_important(event):
                     await mod.queue_event(event)
 
     async def _worker_loop(self):
@@ -422,7 +426,9 @@ class ScanManager:
                     async with self._task_counter.count("get_event_from_modules()"):
                         event, kwargs = self.get_event_from_modules()
                 except asyncio.queues.QueueEmpty:
-                    await asyncio.sleep(0.1)
+                    # sleep until a module (or the manager itself) queues something
+                    self._event_queued.clear()
+                    await self._event_queued.wait()
                     continue
                 async with self._task_counter.count(f"emit_event({event})"):
                     emit_event_task = asyncio.create_task(
@@ -451,6 +457,15 @@ class ScanManager:
             self._incoming_queues = [self.incoming_event_queue] + queues_by_priority
         return self._incoming_queues
 
+    @property
+    def queue_modules(self):
+        """
+        Maps each module's outgoing queue back to its module
+        """
+        if not self._queue_modules:
+            self._queue_modules = {m.outgoing_event_queue: m for m in self.modules_by_priority}
+        return self._queue_modules
+
     @property
     def incoming_qsize(self):
         incoming_events = 0
@@ -467,12 +482,23 @@ class ScanManager:
         return self._module_priority_weights
 
     def get_event_from_modules(self):
-        for q in self.scan.helpers.weighted_shuffle(self.incoming_queues, self.module_priority_weights):
-            try:
-                return q.get_nowait()
-            except (asyncio.queues.QueueEmpty, AttributeError):
-                continue
-        raise asyncio.queues.QueueEmpty()
+        # a weighted pick among the non-empty queues has the same odds as taking the first non-empty queue
+        # from a weighted shuffle of all of them, but it's linear instead of quadratic in the number of modules
+        queues = []
+        weights = []
+        for q, weight in zip(self.incoming_queues, self.module_priority_weights):
+            if q.qsize() > 0:
+                queues.append(q)
+                weights.append(weight)
+        if not queues:
+            raise asyncio.queues.QueueEmpty()
+        q = queues[0] if len(queues) == 1 else random.choices(queues, weights=weights)[0]
+        event_kwargs = q.get_nowait()
+        # wake up the module if it's waiting on space in its outgoing queue
+        module = self.queue_modules.get(q, None)
+        if module is not None:
+            module._event_dequeued.set()
+        return event_kwargs
 
     @property
     def queued_event_types(self):
@@ -499,17 +525,18 @@ class ScanManager:
             # update event's scope distance based on its parent
             event.scope_distance = event.source.scope_distance + 1
             self.incoming_event_queue.put_nowait((event, kwargs))
+            self._event_queued.set()
 
     @property
     def running(self):
-        active_tasks = self._task_counter.value
-        incoming_events = self.incoming_qsize
-        return active_tasks > 0 or incoming_events > 0
+        # short-circuit instead of summing every queue
+        if self._task_counter.value > 0:
+            return True
+        return any(q.qsize() > 0 for q in self.incoming_queues)
 
     @property
     def modules_finished(self):
-        finished_modules = [m.finished for m in self.scan.modules.values()]
-        return all(finished_modules)
+        return all(m.finished for m in self.scan.modules.values())
 
     @property
     def active(self):
@@ -519,21 +546,18 @@ class ScanManager:
         finished = True
         status = {"modules": {}}
 
+        # one pass over the modules (set_error_state() already empties an errored module's queue)
+        modules_errored = []
         for m in self.scan.modules.values():
             mod_status = m.status
             if mod_status["running"]:
                 finished = False
+            if mod_status["errored"]:
+                modules_errored.append(m.name)
             status["modules"][m.name] = mod_status
 
-        for mod in self.scan.modules.values():
-            if mod.errored and mod.incoming_event_queue not in [None, False]:
-                with suppress(Exception):
-                    mod.set_error_state()
-
         status["finished"] = finished
 
-        modules_errored = [m for m, s in status["modules"].items() if s["errored"]]
-
         max_mem_percent = 90
         mem_status = self.scan.helpers.memory_status()
         # abort if we don't have the memory
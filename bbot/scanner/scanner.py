@@ -170,6 +170,8 @@ class Scanner:
             self.id = str(scan_id)
         else:
             self.id = f"SCAN:{sha1(rand_string(20)).hexdigest()}"
+        # reused by the logging helpers
+        self._log_extra = {"scan_id": self.id}
         self._status = "NOT_STARTED"
         self._status_code = 0
 
@@ -359,6 +361,9 @@ class Scanner:
             self._start_modules()
             self.verbose(f"{len(self.modules):,} modules started")
 
+            # the python output module has no worker of its own, so its events are yielded from here
+            python_module = self.modules.get("python", None)
+
             # main scan loop
             while 1:
                 # abort if we're aborting
@@ -366,10 +371,14 @@ class Scanner:
                     self._drain_queues()
                     break
 
-                if "python" in self.modules:
-                    events, finish = await self.modules["python"]._events_waiting()
-                    for e in events:
-                        yield e
+                if python_module is not None:
+                    # clear before draining so that events queued in the meantime still wake us up
+                    python_module._event_received.clear()
+                    # don't bother assembling an empty batch on idle ticks
+                    if python_module.num_incoming_events > 0:
+                        events, finish = await python_module._events_waiting()
+                        for e in events:
+                            yield e
 
                 # if initialization finished and the scan is no longer active
                 if self._finished_init and not self.manager.active:
@@ -377,7 +386,12 @@ class Scanner:
                     if not new_activity:
                         break
 
-                await asyncio.sleep(0.1)
+                if python_module is None:
+                    await asyncio.sleep(0.1)
+                else:
+                    # wake up as soon as there's a new event to yield instead of waiting out the full interval
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(python_module._event_received.wait(), timeout=0.1)
 
             failed = False
 
@@ -610,17 +624,11 @@ class Scanner:
         """
         self.debug("Draining queues")
         for module in self.modules.values():
-            with contextlib.suppress(asyncio.queues.QueueEmpty):
-                while 1:
-                    if module.incoming_event_queue:
-                        module.incoming_event_queue.get_nowait()
-            with contextlib.suppress(asyncio.queues.QueueEmpty):
-                while 1:
-                    if module.outgoing_event_queue:
-                        module.outgoing_event_queue.get_nowait()
-        with contextlib.suppress(asyncio.queues.QueueEmpty):
-            while 1:
-                self.manager.incoming_event_queue.get_nowait()
+            if module.incoming_event_queue:
+                module.incoming_event_queue.clear()
+            if module.outgoing_event_queue:
+                module.outgoing_event_queue.clear()
+        self.manager.incoming_event_queue.clear()
         self.debug("Finished draining queues")
 
     def _cancel_tasks(self):
@@ -687,6 +695,8 @@ class Scanner:
             await mod._cleanup()
         if not self._cleanedup:
             self._cleanedup = True
+            with contextlib.suppress(Exception):
+                await self.helpers.web.close()
             with contextlib.suppress(Exception):
                 self.home.rmdir()
             self.helpers.clean_old_scans()
@@ -812,7 +822,8 @@ class Scanner:
             Execute callback:
             >>> result = await self.scan.run_in_executor(callback_fn, arg1, arg2)
         """
-        callback = partial(callback, **kwargs)
+        if kwargs:
+            callback = partial(callback, **kwargs)
         return self._loop.run_in_executor(None, callback, *args)
 
     def run_in_executor_mp(self, callback, *args, **kwargs):
@@ -824,7 +835,8 @@ class Scanner:
             Execute callback:
             >>> result = await self.scan.run_in_executor_mp(callback_fn, arg1, arg2)
         """
-        callback = partial(callback, **kwargs)
+        if kwargs:
+            callback = partial(callback, **kwargs)
         return self._loop.run_in_executor(self.process_pool, callback, *args)
 
     @property
@@ -882,62 +894,65 @@ class Scanner:
         return j
 
     def debug(self, *args, trace=False, **kwargs):
-        log.debug(*args, extra={"scan_id": self.id}, **kwargs)
+        log.debug(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
     def verbose(self, *args, trace=False, **kwargs):
-        log.verbose(*args, extra={"scan_id": self.id}, **kwargs)
+        log.verbose(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
     def hugeverbose(self, *args, trace=False, **kwargs):
-        log.hugeverbose(*args, extra={"scan_id": self.id}, **kwargs)
+        log.hugeverbose(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
     def info(self, *args, trace=False, **kwargs):
-        log.info(*args, extra={"scan_id": self.id}, **kwargs)
+        log.info(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
     def hugeinfo(self, *args, trace=False, **kwargs):
-        log.hugeinfo(*args, extra={"scan_id": self.id}, **kwargs)
+        log.hugeinfo(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
     def success(self, *args, trace=False, **kwargs):
-        log.success(*args, extra={"scan_id": self.id}, **kwargs)
+        log.success(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
     def hugesuccess(self, *args, trace=False, **kwargs):
-        log.hugesuccess(*args, extra={"scan_id": self.id}, **kwargs)
+        log.hugesuccess(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
     def warning(self, *args, trace=True, **kwargs):
-        log.warning(*args, extra={"scan_id": self.id}, **kwargs)
+        log.warning(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
     def hugewarning(self, *args, trace=True, **kwargs):
-        log.hugewarning(*args, extra={"scan_id": self.id}, **kwargs)
+        log.hugewarning(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
     def error(self, *args, trace=True, **kwargs):
-        log.error(*args, extra={"scan_id": self.id}, **kwargs)
+        log.error(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
     def trace(self):
+        if not log.isEnabledFor(logging.TRACE):
+            return
         e_type, e_val, e_traceback = exc_info()
         if e_type is not None:
-            log.trace(traceback.format_exc())
+            # let the handlers render the traceback, and only if they actually emit the record
+            log.trace(f"{e_type.__name__}: {e_val}", exc_info=(e_type, e_val, e_traceback))
 
     def critical(self, *args, trace=True, **kwargs):
-        log.critical(*args, extra={"scan_id": self.id}, **kwargs)
+        log.critical(*args, extra=self._log_extra, **kwargs)
         if trace:
             self.trace()
 
@@ -110,6 +110,8 @@ async def test_helpers_misc(helpers, scan, bbot_scanner, bbot_config, bbot_https
         "a@a.com",
         "b@b.com",
     )
+    assert list(helpers.extract_emails("var e = 'info@evilcorp.com';")) == ["info@evilcorp.com"]
+    assert list(helpers.extract_emails("_admin@evilcorp.com")) == ["admin@evilcorp.com"]
 
     assert helpers.extract_host("evilcorp.com:80") == ("evilcorp.com", "", ":80")
     assert helpers.extract_host("http://evilcorp.com:80/asdf.php?a=b") == (
@@ -643,9 +645,29 @@ async def test_ratelimiter(helpers):
 @pytest.mark.asyncio
 async def test_async_helpers():
     import random
-    from bbot.core.helpers.async_helpers import async_to_sync_gen
+    from bbot.core.helpers.async_helpers import async_to_sync_gen, ShuffleQueue
     from bbot.core.helpers.misc import as_completed
 
+    # shuffle queue
+    q = ShuffleQueue()
+    for i in range(100):
+        q.put_nowait(i)
+    assert q.qsize() == 100
+    shuffled = [q.get_nowait() for _ in range(100)]
+    assert sorted(shuffled) == list(range(100))
+    assert shuffled != list(range(100))
+    assert q.empty()
+    with pytest.raises(asyncio.QueueEmpty):
+        q.get_nowait()
+    for i in range(10):
+        q.put_nowait(i)
+    assert sorted(q.drain(4) + q.drain()) == list(range(10))
+    assert q.drain() == []
+    for i in range(10):
+        q.put_nowait(i)
+    q.clear()
+    assert q.empty()
+
     # async to sync generator converter
     async def async_gen():
         for i in range(5):
@@ -289,3 +289,90 @@ async def test_modules_basic_perdomainonly(scan, helpers, events, bbot_config, b
             else:
                 assert valid_1 == True
                 assert valid_2 == True
+
+
+@pytest.mark.asyncio
+async def test_modules_basic_backpressure(bbot_config, bbot_scanner):
+    from bbot.modules.base import BaseModule
+
+    class mod_qsize(BaseModule):
+        _name = "mod_qsize"
+        watched_events = ["*"]
+        _qsize = 1
+
+    scan = bbot_scanner("evilcorp.com", config=bbot_config, force_start=True)
+    module = mod_qsize(scan)
+    scan.modules["mod_qsize"] = module
+
+    await module.emit_event_wait("www.evilcorp.com", source=scan.root_event)
+    await module.emit_event_wait("www2.evilcorp.com", source=scan.root_event)
+    assert module.outgoing_event_queue.qsize() == 2
+
+    # the queue is over its limit, so this should wait until the manager takes an event
+    emit_task = asyncio.create_task(module.emit_event_wait("www3.evilcorp.com", source=scan.root_event))
+    await asyncio.sleep(0.1)
+    assert not emit_task.done()
+    scan.manager.get_event_from_modules()
+    await asyncio.wait_for(emit_task, timeout=5)
+    assert module.outgoing_event_queue.qsize() == 2
+
+
+@pytest.mark.asyncio
+async def test_modules_basic_batch(bbot_config, bbot_scanner):
+    from bbot.modules.base import BaseModule
+
+    class mod_batch(BaseModule):
+        _name = "mod_batch"
+        watched_events = ["*"]
+        _batch_size = 3
+
+    scan = bbot_scanner("evilcorp.com", config=bbot_config, force_start=True)
+    module = mod_batch(scan)
+    scan.modules["mod_batch"] = module
+
+    for i in range(5):
+        event = scan.make_event(f"www{i}.evilcorp.com", source=scan.root_event)
+        event.scope_distance = 0
+        await module.queue_event(event)
+    await module.queue_event(scan.make_event("FINISHED", "FINISHED", dummy=True))
+    assert module.num_incoming_events == 6
+
+    batches = []
+    finished = False
+    while module.num_incoming_events:
+        events, finish = await module._events_waiting()
+        batches.append(events)
+        finished |= finish
+    assert finished
+    assert all(len(b) <= 3 for b in batches)
+    assert sorted(e.data for b in batches for e in b) == [f"www{i}.evilcorp.com" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_modules_basic_queue_scope(bbot_config, bbot_scanner):
+    from bbot.modules.base import BaseModule
+
+    class mod_scope_distance(BaseModule):
+        _name = "mod_scope_distance"
+        watched_events = ["*"]
+        scope_distance_modifier = 1
+
+    scan = bbot_scanner("evilcorp.com", config=bbot_config, force_start=True)
+    module = mod_scope_distance(scan)
+    scan.modules["mod_scope_distance"] = module
+    max_scope_distance = module.max_scope_distance
+
+    # a parent that's two hops out, and out of range when it's queued
+    mid_event = scan.make_event("www.evilcorp.net", source=scan.root_event)
+    parent_event = scan.make_event("www.evilcorp.org", source=mid_event)
+    assert parent_event.scope_distance > max_scope_distance
+    await module.queue_event(parent_event)
+    assert module.num_incoming_events == 1
+    assert module._scope_distance_check(parent_event)[0] == False
+
+    # an in-scope child drags the parent's scope distance down while it waits in the queue
+    child_event = scan.make_event("www.evilcorp.com", source=parent_event)
+    child_event.scope_distance = 0
+    assert parent_event.scope_distance == 1
+    assert module.incoming_event_queue.get_nowait() == parent_event
+    assert module._scope_distance_check(parent_event)[0] == True
@@ -28,14 +28,25 @@ async def test_web_helpers(bbot_scanner, bbot_config, bbot_httpserver):
     assert response.status_code == 200
     assert response.text == "test_http_helpers_yep"
 
+    # clients with custom options are pooled
+    client1 = scan1.helpers.web.pooled_client(retries=0)
+    assert scan1.helpers.web.pooled_client(retries=0) is client1
+    assert scan1.helpers.web.pooled_client(retries=2) is not client1
+    await scan1.helpers.web.close()
+    assert client1.is_closed
+    assert scan1.helpers.web.pooled_client(retries=0) is not client1
+
     # download file
     path = "/test_http_helpers_download"
     url = bbot_httpserver.url_for(path)
     download_content = "test_http_helpers_download_yep"
     bbot_httpserver.expect_request(uri=path).respond_with_data(download_content)
+    pooled_clients = dict(scan1.helpers.web._clients)
     filename = await scan1.helpers.download(url)
     assert Path(str(filename)).is_file()
     assert scan1.helpers.is_cached(url)
+    # downloads reuse web_client rather than creating a pooled client
+    assert scan1.helpers.web._clients == pooled_clients
     with open(filename) as f:
         assert f.read() == download_content
     filename = Path("/tmp/bbot_download_test_file")
@@ -98,6 +109,18 @@ async def test_web_helpers(bbot_scanner, bbot_config, bbot_httpserver):
     finally:
         await agen.aclose()
     assert [r.text for r in results] == ["page1", "page2", "page3"]
+    # prefetched pages should still come back in order
+    results = []
+    agen = scan1.helpers.api_page_iter(template_url, json=False, concurrency=3)
+    try:
+        async for result in agen:
+            if result and result.text.startswith("page"):
+                results.append(result)
+            else:
+                break
+    finally:
+        await agen.aclose()
+    assert [r.text for r in results] == ["page1", "page2", "page3"]
 
 
 @pytest.mark.asyncio
@@ -132,6 +155,8 @@ async def test_web_curl(bbot_scanner, bbot_config, bbot_httpserver):
     bbot_httpserver.expect_request(uri="/index.html").respond_with_data("curl_yep_index")
     assert await helpers.curl(url=url) == "curl_yep"
     assert await helpers.curl(url=url, ignore_bbot_global_settings=True) == "curl_yep"
+    # the in-process client sends cURL's default headers, not httpx's
+    assert dict(helpers.web._curl_client().headers) == {"user-agent": "curl/7.88.1", "accept": "*/*"}
     assert (await helpers.curl(url=url, head_mode=True)).startswith("HTTP/")
     assert await helpers.curl(url=url, raw_body="body") == "curl_yep"
     assert (
@@ -2,6 +2,7 @@ import pytest
 import asyncio
 import logging
 import pytest_asyncio
+from functools import lru_cache
 from omegaconf import OmegaConf
 from types import SimpleNamespace
 
@@ -14,6 +15,12 @@ log = logging.getLogger("bbot.test.modules")
 
 
 def tempwordlist(content):
+    # tests with identical wordlists share the same file instead of each writing their own
+    return _tempwordlist(tuple(content))
+
+
+@lru_cache(maxsize=None)
+def _tempwordlist(content):
     tmp_path = "/tmp/.bbot_test/"
     from bbot.core.helpers.misc import rand_string, mkdir
 
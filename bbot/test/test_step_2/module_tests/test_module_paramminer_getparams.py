@@ -1,11 +1,52 @@
 from .test_module_paramminer_headers import Paramminer_Headers, tempwordlist, helper
 
 
-class TestParamminer_Getparams(Paramminer_Headers):
+# returned by the patched rand_string() and gen_cache_buster(); nothing mutates them, so every call can share them
+patched_rand_string = "AAAAAAAAAAAAAA"
+patched_cache_buster = {"AAAAAA": "1"}
+
+# the query strings paramminer sends when using the patched values above
+query_string_id = b"id=AAAAAAAAAAAAAA&AAAAAA=1"
+query_string_boring = b"boring=AAAAAAAAAAAAAA&AAAAAA=1"
+query_string_obscure_parameter = b"obscureParameter=AAAAAAAAAAAAAA&AAAAAA=1"
+query_string_id_hack = b"id=AAAAAAAAAAAAAA&hack=AAAAAAAAAAAAAA&AAAAAA=1"
+query_string_hack = b"hack=AAAAAAAAAAAAAA&AAAAAA=1"
+query_string_abcd1234 = b"abcd1234=AAAAAAAAAAAAAA&AAAAAA=1"
+
+
+def finding_descriptions(events):
+    # descriptions follow "[Paramminer] Getparam: [<param>] Reasons: [<reasons>] Reflection: [<bool>]",
+    # so partial expectations can be anchored with startswith()/endswith() instead of searched for
+    return {e.data["description"] for e in events if e.type == "FINDING"}
+
+
+class Paramminer_Getparams(Paramminer_Headers):
     modules_overrides = ["httpx", "paramminer_getparams"]
+    # if set, replaces the module's boring words
+    boring_words = None
+
+    def expected_requests(self):
+        """
+        (expect_args, respond_args) pairs to register with the test webserver, in order
+        """
+        return ()
+
+    async def setup_after_prep(self, module_test):
+        module = module_test.scan.modules["paramminer_getparams"]
+        module.rand_string = lambda *args, **kwargs: patched_rand_string
+        if self.boring_words is not None:
+            module.boring_words = self.boring_words
+        module_test.monkeypatch.setattr(
+            helper.HttpCompare, "gen_cache_buster", lambda *args, **kwargs: patched_cache_buster
+        )
+        for expect_args, respond_args in self.expected_requests():
+            module_test.set_expect_requests(expect_args=expect_args, respond_args=respond_args)
+
+
+class TestParamminer_Getparams(Paramminer_Getparams):
     config_overrides = {"modules": {"paramminer_getparams": {"wordlist": tempwordlist(["canary", "id"])}}}
 
-    getparam_body = """
+    getparam_body = b"""
     <html>
     <title>the title</title>
     <body>
@@ -14,7 +55,7 @@ class TestParamminer_Getparams(Paramminer_Headers):
     </html>
     """
 
-    getparam_body_match = """
+    getparam_body_match = b"""
     <html>
     <title>the title</title>
     <body>
@@ -23,32 +64,20 @@ class TestParamminer_Getparams(Paramminer_Headers):
     </html>
     """
 
-    async def setup_after_prep(self, module_test):
-        module_test.scan.modules["paramminer_getparams"].rand_string = lambda *args, **kwargs: "AAAAAAAAAAAAAA"
-        module_test.monkeypatch.setattr(
-            helper.HttpCompare, "gen_cache_buster", lambda *args, **kwargs: {"AAAAAA": "1"}
+    def expected_requests(self):
+        return (
+            ({"query_string": query_string_id}, {"response_data": self.getparam_body_match}),
+            ({}, {"response_data": self.getparam_body}),
         )
-        expect_args = {"query_string": b"id=AAAAAAAAAAAAAA&AAAAAA=1"}
-        respond_args = {"response_data": self.getparam_body_match}
-        module_test.set_expect_requests(expect_args=expect_args, respond_args=respond_args)
-
-        respond_args = {"response_data": self.getparam_body}
-        module_test.set_expect_requests(respond_args=respond_args)
 
     def check(self, module_test, events):
-        assert any(
-            e.type == "FINDING"
-            and "[Paramminer] Getparam: [id] Reasons: [body] Reflection: [True]" in e.data["description"]
-            for e in events
-        )
-        assert not any(
-            e.type == "FINDING" and "[Paramminer] Getparam: [canary] Reasons: [body]" in e.data["description"]
-            for e in events
-        )
+        descriptions = finding_descriptions(events)
+        assert "[Paramminer] Getparam: [id] Reasons: [body] Reflection: [True]" in descriptions
+        assert not any("[Paramminer] Getparam: [canary] Reasons: [body]" in d for d in descriptions)
 
 
 class TestParamminer_Getparams_noreflection(TestParamminer_Getparams):
-    getparam_body_match = """
+    getparam_body_match = b"""
     <html>
     <title>the title</title>
     <body>
@@ -58,11 +87,7 @@ class TestParamminer_Getparams_noreflection(TestParamminer_Getparams):
     """
 
     def check(self, module_test, events):
-        assert any(
-            e.type == "FINDING"
-            and "[Paramminer] Getparam: [id] Reasons: [body] Reflection: [False]" in e.data["description"]
-            for e in events
-        )
+        assert "[Paramminer] Getparam: [id] Reasons: [body] Reflection: [False]" in finding_descriptions(events)
 
 
 class TestParamminer_Getparams_singlewordlist(TestParamminer_Getparams):
@@ -76,23 +101,17 @@ class TestParamminer_Getparams_boring_off(TestParamminer_Getparams):
         }
     }
 
-    async def setup_after_prep(self, module_test):
-        module_test.scan.modules["paramminer_getparams"].rand_string = lambda *args, **kwargs: "AAAAAAAAAAAAAA"
-        module_test.scan.modules["paramminer_getparams"].boring_words = {"boring"}
-        module_test.monkeypatch.setattr(
-            helper.HttpCompare, "gen_cache_buster", lambda *args, **kwargs: {"AAAAAA": "1"}
-        )
-        expect_args = {"query_string": b"boring=AAAAAAAAAAAAAA&AAAAAA=1"}
-        respond_args = {"response_data": self.getparam_body_match}
-        module_test.set_expect_requests(expect_args=expect_args, respond_args=respond_args)
+    boring_words = {"boring"}
 
-        respond_args = {"response_data": self.getparam_body}
-        module_test.set_expect_requests(respond_args=respond_args)
+    def expected_requests(self):
+        return (
+            ({"query_string": query_string_boring}, {"response_data": self.getparam_body_match}),
+            ({}, {"response_data": self.getparam_body}),
+        )
 
     def check(self, module_test, events):
         assert any(
-            e.type == "FINDING" and "[Paramminer] Getparam: [boring] Reasons: [body]" in e.data["description"]
-            for e in events
+            d.startswith("[Paramminer] Getparam: [boring] Reasons: [body]") for d in finding_descriptions(events)
         )
 
 
@@ -104,140 +123,115 @@ class TestParamminer_Getparams_boring_on(TestParamminer_Getparams_boring_off):
     }
 
     def check(self, module_test, events):
-        assert not any(
-            e.type == "FINDING" and "[Paramminer] Getparam: [boring] Reasons: [body]" in e.data["description"]
-            for e in events
-        )
+        assert not any("[Paramminer] Getparam: [boring] Reasons: [body]" in d for d in finding_descriptions(events))
 
 
-class TestParamminer_Getparams_Extract_Json(Paramminer_Headers):
-    modules_overrides = ["httpx", "paramminer_getparams"]
+class TestParamminer_Getparams_Extract_Json(Paramminer_Getparams):
     config_overrides = {"modules": {"paramminer_getparams": {"wordlist": tempwordlist([]), "http_extract": True}}}
 
-    getparam_extract_json = """
+    getparam_extract_json = b"""
     {
   "obscureParameter": 1,
   "common": 1
 }
     """
 
-    getparam_extract_json_match = """
+    getparam_extract_json_match = b"""
     {
   "obscureParameter": "AAAAAAAAAAAAAA",
   "common": 1
 }
     """
 
-    async def setup_after_prep(self, module_test):
-        module_test.scan.modules["paramminer_getparams"].rand_string = lambda *args, **kwargs: "AAAAAAAAAAAAAA"
-        module_test.monkeypatch.setattr(
-            helper.HttpCompare, "gen_cache_buster", lambda *args, **kwargs: {"AAAAAA": "1"}
+    def expected_requests(self):
+        headers = {"Content-Type": "application/json"}
+        return (
+            (
+                {"query_string": query_string_obscure_parameter},
+                {"response_data": self.getparam_extract_json_match, "headers": headers},
+            ),
+            ({}, {"response_data": self.getparam_extract_json, "headers": headers}),
         )
 
-        expect_args = {"query_string": b"obscureParameter=AAAAAAAAAAAAAA&AAAAAA=1"}
-        respond_args = {
-            "response_data": self.getparam_extract_json_match,
-            "headers": {"Content-Type": "application/json"},
-        }
-        module_test.set_expect_requests(expect_args=expect_args, respond_args=respond_args)
-
-        respond_args = {"response_data": self.getparam_extract_json, "headers": {"Content-Type": "application/json"}}
-        module_test.set_expect_requests(respond_args=respond_args)
-
     def check(self, module_test, events):
         assert any(
-            e.type == "FINDING"
-            and "[Paramminer] Getparam: [obscureParameter] Reasons: [body]" in e.data["description"]
-            for e in events
+            d.startswith("[Paramminer] Getparam: [obscureParameter] Reasons: [body]")
+            for d in finding_descriptions(events)
         )
 
 
-class TestParamminer_Getparams_Extract_Xml(Paramminer_Headers):
-    modules_overrides = ["httpx", "paramminer_getparams"]
+class TestParamminer_Getparams_Extract_Xml(Paramminer_Getparams):
     config_overrides = {
         "modules": {
             "paramminer_getparams": {"wordlist": tempwordlist([]), "http_extract": True, "skip_boring_words": True}
         }
     }
 
-    getparam_extract_xml = """
+    getparam_extract_xml = b"""
 <data>
     <obscureParameter>1</obscureParameter>
     <common>1</common>
 </data>
     """
 
-    getparam_extract_xml_match = """
+    getparam_extract_xml_match = b"""
 <data>
     <obscureParameter>AAAAAAAAAAAAAA</obscureParameter>
     <common>1</common>
 </data>
     """
 
-    async def setup_after_prep(self, module_test):
-        module_test.scan.modules["paramminer_getparams"].rand_string = lambda *args, **kwargs: "AAAAAAAAAAAAAA"
-        module_test.monkeypatch.setattr(
-            helper.HttpCompare, "gen_cache_buster", lambda *args, **kwargs: {"AAAAAA": "1"}
-        )
-        module_test.scan.modules["paramminer_getparams"].boring_words = {"data", "common"}
-
-        expect_args = {"query_string": b"obscureParameter=AAAAAAAAAAAAAA&AAAAAA=1"}
-        respond_args = {
-            "response_data": self.getparam_extract_xml_match,
-            "headers": {"Content-Type": "application/xml"},
-        }
-        module_test.set_expect_requests(expect_args=expect_args, respond_args=respond_args)
+    boring_words = {"data", "common"}
 
-        respond_args = {"response_data": self.getparam_extract_xml, "headers": {"Content-Type": "application/xml"}}
-        module_test.set_expect_requests(respond_args=respond_args)
+    def expected_requests(self):
+        headers = {"Content-Type": "application/xml"}
+        return (
+            (
+                {"query_string": query_string_obscure_parameter},
+                {"response_data": self.getparam_extract_xml_match, "headers": headers},
+            ),
+            ({}, {"response_data": self.getparam_extract_xml, "headers": headers}),
+        )
 
     def check(self, module_test, events):
         assert any(
-            e.type == "FINDING"
-            and "[Paramminer] Getparam: [obscureParameter] Reasons: [body]" in e.data["description"]
-            for e in events
+            d.startswith("[Paramminer] Getparam: [obscureParameter] Reasons: [body]")
+            for d in finding_descriptions(events)
         )
 
 
-class TestParamminer_Getparams_Extract_Html(Paramminer_Headers):
-    modules_overrides = ["httpx", "paramminer_getparams"]
+class TestParamminer_Getparams_Extract_Html(Paramminer_Getparams):
     config_overrides = {
         "modules": {"paramminer_getparams": {"wordlist": tempwordlist(["canary"]), "http_extract": True}}
     }
 
-    getparam_extract_html = """
+    getparam_extract_html = b"""
 <html><a href="/?hack=1">ping</a></html>
     """
 
-    getparam_extract_html_match = """
+    getparam_extract_html_match = b"""
 <html><a href="/?hack=1">ping</a><p>HackThePlanet</p></html>
     """
 
-    async def setup_after_prep(self, module_test):
-        module_test.scan.modules["paramminer_getparams"].rand_string = lambda *args, **kwargs: "AAAAAAAAAAAAAA"
-        module_test.monkeypatch.setattr(
-            helper.HttpCompare, "gen_cache_buster", lambda *args, **kwargs: {"AAAAAA": "1"}
+    def expected_requests(self):
+        headers = {"Content-Type": "text/html"}
+        return (
+            (
+                {"query_string": query_string_id_hack},
+                {"response_data": self.getparam_extract_html_match, "headers": headers},
+            ),
+            (
+                {"query_string": query_string_hack},
+                {"response_data": self.getparam_extract_html_match, "headers": headers},
+            ),
+            ({}, {"response_data": self.getparam_extract_html, "headers": headers}),
         )
 
-        expect_args = {"query_string": b"id=AAAAAAAAAAAAAA&hack=AAAAAAAAAAAAAA&AAAAAA=1"}
-        respond_args = {"response_data": self.getparam_extract_html_match, "headers": {"Content-Type": "text/html"}}
-        module_test.set_expect_requests(expect_args=expect_args, respond_args=respond_args)
-
-        expect_args = {"query_string": b"hack=AAAAAAAAAAAAAA&AAAAAA=1"}
-        respond_args = {"response_data": self.getparam_extract_html_match, "headers": {"Content-Type": "text/html"}}
-        module_test.set_expect_requests(expect_args=expect_args, respond_args=respond_args)
-
-        respond_args = {"response_data": self.getparam_extract_html, "headers": {"Content-Type": "text/html"}}
-        module_test.set_expect_requests(respond_args=respond_args)
-
     def check(self, module_test, events):
-        assert any(
-            e.type == "FINDING" and "[Paramminer] Getparam: [hack] Reasons: [body]" in e.data["description"]
-            for e in events
-        )
+        assert any(d.startswith("[Paramminer] Getparam: [hack] Reasons: [body]") for d in finding_descriptions(events))
 
 
-class TestParamminer_Getparams_finish(Paramminer_Headers):
+class TestParamminer_Getparams_finish(Paramminer_Getparams):
     modules_overrides = ["httpx", "excavate", "paramminer_getparams"]
     config_overrides = {
         "modules": {"paramminer_getparams": {"wordlist": tempwordlist(["canary", "canary2"]), "http_extract": True}}
@@ -245,38 +239,27 @@ class TestParamminer_Getparams_finish(Paramminer_Headers):
 
     targets = ["http://127.0.0.1:8888/test1.php", "http://127.0.0.1:8888/test2.php"]
 
-    test_1_html = """
+    test_1_html = b"""
 <html><a href="/test2.php?abcd1234=foo">paramstest2</a></html>
     """
 
-    test_2_html = """
+    test_2_html = b"""
 <html></a><p>Hello</p></html>
     """
 
-    test_2_html_match = """
+    test_2_html_match = b"""
 <html></a><p>HackThePlanet!</p></html>
     """
 
-    async def setup_after_prep(self, module_test):
-        module_test.scan.modules["paramminer_getparams"].rand_string = lambda *args, **kwargs: "AAAAAAAAAAAAAA"
-        module_test.monkeypatch.setattr(
-            helper.HttpCompare, "gen_cache_buster", lambda *args, **kwargs: {"AAAAAA": "1"}
+    def expected_requests(self):
+        return (
+            (
+                {"uri": "/test2.php", "query_string": query_string_abcd1234},
+                {"response_data": self.test_2_html_match},
+            ),
+            ({"uri": "/test2.php"}, {"response_data": self.test_2_html}),
+            ({"uri": "/test1.php"}, {"response_data": self.test_1_html}),
         )
 
-        expect_args = {"uri": "/test2.php", "query_string": b"abcd1234=AAAAAAAAAAAAAA&AAAAAA=1"}
-        respond_args = {"response_data": self.test_2_html_match}
-        module_test.set_expect_requests(expect_args=expect_args, respond_args=respond_args)
-
-        expect_args = {"uri": "/test2.php"}
-        respond_args = {"response_data": self.test_2_html}
-        module_test.set_expect_requests(expect_args=expect_args, respond_args=respond_args)
-
-        expect_args = {"uri": "/test1.php"}
-        respond_args = {"response_data": self.test_1_html}
-        module_test.set_expect_requests(expect_args=expect_args, respond_args=respond_args)
-
     def check(self, module_test, events):
-        assert any(
-            e.type == "FINDING" and "[abcd1234] Reasons: [body] Reflection: [False]" in e.data["description"]
-            for e in events
-        )
+        assert any(d.endswith("[abcd1234] Reasons: [body] Reflection: [False]") for d in finding_descriptions(events))